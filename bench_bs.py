@@ -0,0 +1,66 @@
+"""Black-Scholes pricing throughput, in options per second.
+
+Compares the scalar ``bs_price`` loop with the array pricer, and times the
+Greeks, implied-volatility, Monte Carlo and binomial-tree pricers::
+
+    python3 bench_bs.py --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from bs_engines import binomial_price, mc_price
+from bs_greeks import greeks_vec, implied_vol
+from bs_model import bs_price, bs_price_vec
+
+
+def chain(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(50, 150, n), rng.uniform(50, 150, n), rng.uniform(0.05, 2, n),
+            rng.uniform(0, 0.1, n), rng.uniform(0.05, 0.6, n), rng.random(n) < 0.5)
+
+
+def report(label, n, seconds, baseline=None):
+    rate = n / seconds
+    extra = f"  ({rate / baseline:.0f}x)" if baseline else ""
+    print(f"{label:<24}{rate:>16,.0f} options/s{extra}")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--paths", type=int, default=2_000_000, help="Monte Carlo paths")
+    parser.add_argument("--steps", type=int, default=2_000, help="binomial tree steps")
+    args = parser.parse_args()
+    S, K, T, r, sigma, is_call = chain(args.rows)
+    n_loop = min(args.rows, 100_000)
+    rows = list(zip(S.tolist(), K.tolist(), T.tolist(), r.tolist(), sigma.tolist(), is_call.tolist()))[:n_loop]
+    start = time.perf_counter()
+    for s, k, t, rr, v, c in rows:
+        bs_price(s, k, t, rr, v, "Call" if c else "Put")
+    base = report("bs_price loop", n_loop, time.perf_counter() - start)
+    start = time.perf_counter()
+    prices = bs_price_vec(S, K, T, r, sigma, is_call)
+    report("bs_price_vec", args.rows, time.perf_counter() - start, base)
+    start = time.perf_counter()
+    greeks_vec(S, K, T, r, sigma, is_call)
+    report("greeks_vec", args.rows, time.perf_counter() - start)
+    n_iv = min(args.rows, 50_000)
+    start = time.perf_counter()
+    implied_vol(prices[:n_iv], S[:n_iv], K[:n_iv], T[:n_iv], r[:n_iv], is_call[:n_iv])
+    report(f"implied_vol ({n_iv:,})", n_iv, time.perf_counter() - start)
+    exact = bs_price(100.0, 100.0, 1.0, 0.05, 0.2, "Call")
+    start = time.perf_counter()
+    price, err = mc_price(100.0, 100.0, 1.0, 0.05, 0.2, "Call", paths=args.paths, seed=0)
+    rate = args.paths / (time.perf_counter() - start)
+    print(f"{'mc_price':<24}{rate:>16,.0f} paths/s    error {price - exact:+.5f} (se {err:.5f})")
+    start = time.perf_counter()
+    price = binomial_price(100.0, 100.0, 1.0, 0.05, 0.2, "Call", steps=args.steps)
+    rate = args.steps / (time.perf_counter() - start)
+    print(f"{'binomial_price':<24}{rate:>16,.0f} steps/s    error {price - exact:+.5f} ({args.steps} steps)")
+
+
+if __name__ == "__main__":
+    main()
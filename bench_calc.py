@@ -0,0 +1,52 @@
+"""Throughput of expression evaluation, in rows per second.
+
+Compares ``calc_expr`` column evaluation (vectorized when NumPy is installed)
+with calling ``Calculator`` methods one row at a time::
+
+    python3 bench_calc.py --rows 1000000
+"""
+import argparse
+import random
+import time
+
+from calc import Calculator
+from calc_expr import compile_expr
+
+EXPR = "(a*b)+c/d"
+
+
+def per_row(calc, cols, n):
+    a, b, c, d = cols["a"], cols["b"], cols["c"], cols["d"]
+    return [calc.add(calc.mul(a[i], b[i]), calc.div(c[i], d[i])) for i in range(n)]
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    n = args.rows
+    rnd = random.Random(0)
+    cols = {name: [rnd.uniform(1, 100) for _ in range(n)] for name in "abcd"}
+    calc = Calculator()
+    expr = compile_expr(EXPR)
+    baseline = timed(lambda: per_row(calc, cols, n), n)
+    print(f"{'Calculator per row':<28}{baseline:>14,.0f} rows/s")
+    columnar = timed(lambda: expr.evaluate_columns(cols, calc), n)
+    print(f"{'compile_expr columns':<28}{columnar:>14,.0f} rows/s  ({columnar / baseline:.1f}x)")
+    try:
+        import numpy as np
+    except ModuleNotFoundError:
+        return
+    arrays = {k: np.asarray(v) for k, v in cols.items()}
+    vectorized = timed(lambda: expr.evaluate_columns(arrays, calc), n)
+    print(f"{'compile_expr numpy arrays':<28}{vectorized:>14,.0f} rows/s  ({vectorized / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Dashboard redraw time on the headless Agg backend, in ms per frame.
+
+Compares the clear/replot/tight_layout/draw path with
+:class:`dashboard_plot.SeriesRenderer` for data-only updates of many
+countries and for a single very long series::
+
+    python3 bench_dashboard.py --countries 20 --points 1000000
+"""
+import argparse
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from dashboard_plot import SeriesRenderer
+
+
+def frames(countries, years, n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(2024 - years, 2024)
+    base = rng.uniform(1, 2, (countries, 1)) * 1e12
+    return [{f"C{j:03d}": (x, base[j] * (1 + 0.01 * rng.standard_normal(years))) for j in range(countries)}
+            for _ in range(n)]
+
+
+def replot(fig, ax, series):
+    ax.clear()
+    for label, (x, y) in series.items():
+        ax.plot(x, y, marker="o", label=label)
+    ax.set_title("bench")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("GDP")
+    if len(series) > 1:
+        ax.legend(fontsize="small")
+    fig.tight_layout()
+    fig.canvas.draw()
+
+
+def time_frames(draw, sequence):
+    draw(sequence[0])
+    start = time.perf_counter()
+    for series in sequence[1:]:
+        draw(series)
+    return 1000 * (time.perf_counter() - start) / (len(sequence) - 1)
+
+
+def report(label, ms, baseline=None):
+    extra = f"  ({baseline / ms:.1f}x)" if baseline else ""
+    print(f"{label:<32}{ms:>10.2f} ms/frame{extra}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--countries", type=int, default=20)
+    parser.add_argument("--years", type=int, default=64)
+    parser.add_argument("--points", type=int, default=1_000_000, help="length of the long series")
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+    sequence = frames(args.countries, args.years, args.frames)
+    fig, ax = plt.subplots(figsize=(8, 5))
+    base = time_frames(lambda s: replot(fig, ax, s), sequence)
+    report(f"replot, {args.countries} countries", base)
+    fig, ax = plt.subplots(figsize=(8, 5))
+    renderer = SeriesRenderer(fig, ax)
+    ms = time_frames(lambda s: renderer.render(s, "line", "bench", "Year", "GDP"), sequence)
+    report(f"renderer, {args.countries} countries", ms, base)
+    print(f"{'':<32}{renderer.full_draws} full draws, {renderer.blits} blits")
+
+    x = np.arange(args.points, dtype=float)
+    rng = np.random.default_rng(1)
+    long = [{"long": (x, np.cumsum(rng.standard_normal(args.points)))} for _ in range(4)]
+    fig, ax = plt.subplots(figsize=(8, 5))
+    base = time_frames(lambda s: replot(fig, ax, s), long)
+    report(f"replot, {args.points:,} points", base)
+    fig, ax = plt.subplots(figsize=(8, 5))
+    renderer = SeriesRenderer(fig, ax)
+    ms = time_frames(lambda s: renderer.render(s, "line", "bench", "Year", "GDP"), long)
+    report(f"renderer, {args.points:,} points", ms, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,17 @@
 # coding: utf-8
+import collections
+import time
 import tkinter as tk
 from tkinter import ttk
-import math
 
-
-def cnd(x: float) -> float:
-    """Cumulative normal distribution using error function."""
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-
-def bs_price(S: float, K: float, T: float, r: float, sigma: float, option: str) -> float:
-    """Calculate Black-Scholes option price."""
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return 0.0
-    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-    if option == "Call":
-        return S * cnd(d1) - K * math.exp(-r * T) * cnd(d2)
-    else:
-        return K * math.exp(-r * T) * cnd(-d2) - S * cnd(-d1)
+from bs_model import bs_price, bs_price_vec, cnd, np
+from bs_surface import SurfaceCache
 
 
 n_points = 100
+frame_budget_ms = 16
+heat_cols, heat_rows = 40, 30
+heat_palette = [f"#{int(255 * i / 63):02x}40{int(255 * (63 - i) / 63):02x}" for i in range(64)]
 
 
 class BlackScholesApp:
@@ -44,20 +34,53 @@ class BlackScholesApp:
         self._add_slider(ctrl, "sigma", 0.05, 0.5)
         self._add_slider(ctrl, "T", 0.1, 2.0)
         ttk.Label(ctrl, text="Type").pack()
-        ttk.OptionMenu(ctrl, self.vars["type"], "Call", "Call", "Put", command=lambda _v: self.update()).pack(fill=tk.X)
+        ttk.OptionMenu(ctrl, self.vars["type"], "Call", "Call", "Put", command=lambda _v: self.schedule_update()).pack(fill=tk.X)
         self.price_lbl = ttk.Label(ctrl, text="Price: 0.00", font=("Arial", 14))
         self.price_lbl.pack(pady=10)
+        self.greeks_lbl = ttk.Label(ctrl, text="", justify=tk.LEFT)
+        self.greeks_lbl.pack()
+        self.show_heatmap = tk.BooleanVar(value=False)
+        self.surfaces = SurfaceCache() if np is not None else None
+        if self.surfaces is not None:
+            ttk.Checkbutton(ctrl, text="Heatmap (S x sigma)", variable=self.show_heatmap,
+                            command=self.schedule_update).pack(pady=5)
+        self.heat_canvas = None
         self.canvas = tk.Canvas(root, width=400, height=300, bg="white")
         self.canvas.pack(side=tk.RIGHT, padx=10, pady=10)
+        width = int(self.canvas["width"])
+        height = int(self.canvas["height"])
+        self.canvas.create_line(0, height, width, height, fill="black")
+        self.canvas.create_line(0, 0, 0, height, fill="black")
+        self.curve = self.canvas.create_line(0, height, 0, height, fill="blue")
+        # Render durations in seconds; on_frame(seconds) is called after each render.
+        self.frame_times = collections.deque(maxlen=120)
+        self.on_frame = None
+        self._pending = None
+        self._last_render = 0.0
         self.update()
 
     def _add_slider(self, frame: ttk.Frame, name: str, fr: float, to: float) -> None:
         ttk.Label(frame, text=name).pack()
         ttk.Scale(frame, variable=self.vars[name], from_=fr, to=to,
-                  command=lambda _e: self.update()).pack(fill=tk.X)
+                  command=lambda _e: self.schedule_update()).pack(fill=tk.X)
         ttk.Entry(frame, textvariable=self.vars[name], width=7).pack(pady=(0, 5))
 
+    def schedule_update(self) -> None:
+        """Coalesce change events so that at most one render happens per frame."""
+        if self._pending is not None:
+            return
+        wait_ms = frame_budget_ms - (time.perf_counter() - self._last_render) * 1000
+        if wait_ms > 0:
+            self._pending = self.root.after(int(wait_ms) + 1, self._run_pending)
+        else:
+            self._pending = self.root.after_idle(self._run_pending)
+
+    def _run_pending(self) -> None:
+        self._pending = None
+        self.update()
+
     def update(self) -> None:
+        start = time.perf_counter()
         S = self.vars["S"].get()
         K = self.vars["K"].get()
         r = self.vars["r"].get()
@@ -67,25 +90,75 @@ class BlackScholesApp:
         price = bs_price(S, K, T, r, sigma, otype)
         self.price_lbl.configure(text=f"Price: {price:.2f}")
         self._draw_chart(K, T, r, sigma, otype)
+        if self.show_heatmap.get():
+            self._draw_heatmap(S, K, r, sigma, T, otype)
+        elif self.heat_canvas is not None:
+            self.heat_canvas.pack_forget()
+        self._last_render = time.perf_counter()
+        elapsed = self._last_render - start
+        self.frame_times.append(elapsed)
+        if self.on_frame is not None:
+            self.on_frame(elapsed)
 
     def _draw_chart(self, K: float, T: float, r: float, sigma: float, otype: str) -> None:
-        self.canvas.delete("all")
         width = int(self.canvas["width"])
         height = int(self.canvas["height"])
         s_min = 0.5 * K
         s_max = 1.5 * K
-        last_x, last_y = None, None
-        for i in range(n_points + 1):
-            s = s_min + (s_max - s_min) * i / n_points
-            p = bs_price(s, K, T, r, sigma, otype)
+        spots = [s_min + (s_max - s_min) * i / n_points for i in range(n_points + 1)]
+        if np is not None:
+            prices = bs_price_vec(spots, K, T, r, sigma, otype == "Call").tolist()
+        else:
+            prices = [bs_price(s, K, T, r, sigma, otype) for s in spots]
+        coords = []
+        for s, p in zip(spots, prices):
             x = int((s - s_min) / (s_max - s_min) * width)
             y = height - int(p / (K * 0.6) * height)
-            y = min(max(y, 0), height)
-            if last_x is not None:
-                self.canvas.create_line(last_x, last_y, x, y, fill="blue")
-            last_x, last_y = x, y
-        self.canvas.create_line(0, height, width, height, fill="black")
-        self.canvas.create_line(0, 0, 0, height, fill="black")
+            coords += (x, min(max(y, 0), height))
+        self.canvas.coords(self.curve, *coords)
+
+    def _draw_heatmap(self, S: float, K: float, r: float, sigma: float, T: float, otype: str) -> None:
+        """Price over the S x sigma plane at the current T, read from the background surface."""
+        if self.heat_canvas is None:
+            self._create_heatmap()
+        self.heat_canvas.pack(side=tk.BOTTOM, padx=10, pady=10)
+        try:
+            surface = self.surfaces.get(K, r, otype)
+        except Exception as e:
+            # No retry polling: the same inputs would fail again
+            self.greeks_lbl.configure(text=f"surface failed: {e}")
+            return
+        if surface is None:
+            self.greeks_lbl.configure(text="computing surface...")
+            self.root.after(50, self.schedule_update)
+            return
+        s_axis, v_axis = surface.axes[0], surface.axes[1]
+        spots = np.linspace(s_axis[0], s_axis[-1], heat_cols)
+        vols = np.linspace(v_axis[-1], v_axis[0], heat_rows)
+        grid = surface.query(spots[None, :], vols[:, None], T)
+        lo, hi = grid.min(), grid.max()
+        shades = ((grid - lo) / ((hi - lo) or 1.0) * (len(heat_palette) - 1)).astype(int).ravel().tolist()
+        for cell, shade, last in zip(self.heat_cells, shades, self._heat_shades):
+            if shade != last:
+                self.heat_canvas.itemconfigure(cell, fill=heat_palette[shade])
+        self._heat_shades = shades
+        width, height = int(self.heat_canvas["width"]), int(self.heat_canvas["height"])
+        x = (S - s_axis[0]) / (s_axis[-1] - s_axis[0]) * width
+        y = (v_axis[-1] - sigma) / (v_axis[-1] - v_axis[0]) * height
+        self.heat_canvas.coords(self.heat_marker, x - 4, y - 4, x + 4, y + 4)
+        g = {name: float(surface.query(S, sigma, T, name)) for name in ("delta", "gamma", "vega")}
+        self.greeks_lbl.configure(text="Delta: {delta:.3f}\nGamma: {gamma:.4f}\nVega: {vega:.2f}".format(**g))
+
+    def _create_heatmap(self) -> None:
+        self.heat_canvas = tk.Canvas(self.root, width=400, height=300, bg="white")
+        width, height = int(self.heat_canvas["width"]), int(self.heat_canvas["height"])
+        cw, ch = width / heat_cols, height / heat_rows
+        self.heat_cells = [
+            self.heat_canvas.create_rectangle(c * cw, r * ch, (c + 1) * cw, (r + 1) * ch, width=0)
+            for r in range(heat_rows) for c in range(heat_cols)
+        ]
+        self._heat_shades = [None] * len(self.heat_cells)
+        self.heat_marker = self.heat_canvas.create_oval(0, 0, 0, 0, outline="white", width=2)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+# coding: utf-8
+"""Headless option-chain pricer.
+
+Streams a CSV or Parquet chain with columns ``S, K, T, r, sigma, type``
+(``type`` is ``Call`` or ``Put``) in chunks, prices each chunk with Greeks
+in a process pool and appends the results to the output as they complete,
+so memory stays bounded by ``workers * chunk_size`` rows::
+
+    python3 bs_chain.py chain.csv -o priced.csv --workers 4 --chunk-size 100000
+"""
+import argparse
+import collections
+import csv
+import io
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bs_greeks import GREEKS, greeks_vec
+from bs_model import np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+COLUMNS = ("S", "K", "T", "r", "sigma", "type")
+NUMERIC = COLUMNS[:-1]
+FIELDS = COLUMNS + GREEKS
+
+
+def read_chunks(path, chunk_size):
+    """Yield the chain in chunks of at most ``chunk_size`` rows.
+
+    CSV chunks are left as raw text (header line included) so that parsing
+    happens in the worker processes; Parquet chunks are dicts of columns.
+    """
+    if str(path).endswith(".parquet"):
+        if pq is None:
+            raise ImportError("pyarrow is required for Parquet input")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=list(COLUMNS)):
+            yield {name: batch.column(name).to_numpy(zero_copy_only=False) for name in COLUMNS}
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        header = f.readline()
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            yield header + "".join(lines)
+
+
+def parse_chunk(chunk):
+    """Turn a chunk from :func:`read_chunks` into a dict of column arrays."""
+    if isinstance(chunk, str):
+        rows = list(csv.reader(io.StringIO(chunk)))
+        index = [rows[0].index(name) for name in COLUMNS]
+        chunk = {name: [row[i] for row in rows[1:] if row] for name, i in zip(COLUMNS, index)}
+    out = {name: np.asarray(chunk[name], dtype=float) for name in NUMERIC}
+    out["type"] = np.asarray(chunk["type"], dtype=str)
+    return out
+
+
+def price_chunk(chunk, as_csv=False):
+    """Parse one chunk and add price and Greek columns (runs in a worker process).
+
+    With ``as_csv`` the result is returned as CSV rows without a header, so
+    formatting is done in the workers as well.
+    """
+    columns = parse_chunk(chunk)
+    columns.update(greeks_vec(columns["S"], columns["K"], columns["T"], columns["r"], columns["sigma"],
+                              columns["type"] == "Call"))
+    if not as_csv:
+        return columns
+    text = [columns[name].tolist() if name == "type" else list(map("{:.12g}".format, columns[name].tolist()))
+            for name in FIELDS]
+    return "".join(",".join(row) + "\n" for row in zip(*text))
+
+
+def price_chunks(chunks, workers=None, as_csv=False):
+    """Price ``chunks`` in order, keeping at most ``2 * workers`` in flight."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield price_chunk(chunk, as_csv)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(price_chunk, chunk, as_csv))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ChunkWriter:
+    """Append priced chunks to a CSV file (or stdout) or a Parquet file."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.as_csv = not (path and str(path).endswith(".parquet"))
+        self._parquet = None
+        self._file = None
+        if not self.as_csv:
+            if pq is None:
+                raise ImportError("pyarrow is required for Parquet output")
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8") if path else sys.stdout
+            self._file.write(",".join(FIELDS) + "\n")
+
+    def write(self, chunk) -> int:
+        """Write one result of :func:`price_chunk` and return its row count."""
+        if self.as_csv:
+            self._file.write(chunk)
+            return chunk.count("\n")
+        table = pa.table({name: chunk[name] for name in FIELDS})
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        self._parquet.write_table(table)
+        return table.num_rows
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+        elif self._file not in (None, sys.stdout):
+            self._file.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Price an option chain with Greeks, without the GUI")
+    parser.add_argument("chain", help="input chain (.csv or .parquet)")
+    parser.add_argument("-o", "--output", help="output file (.csv or .parquet); CSV on stdout by default")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows per chunk")
+    args = parser.parse_args(argv)
+    if np is None:
+        raise SystemExit("NumPy is required for bs_chain.py")
+    writer = ChunkWriter(args.output)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in price_chunks(read_chunks(args.chain, args.chunk_size), args.workers, writer.as_csv):
+            rows += writer.write(chunk)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"priced {rows:,} options in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} options/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
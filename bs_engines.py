@@ -0,0 +1,108 @@
+# coding: utf-8
+"""Numerical pricers next to the closed-form Black-Scholes model.
+
+* :func:`mc_price` - European options by Monte Carlo, with antithetic
+  variates, a control variate (the discounted terminal spot, whose expectation
+  is known exactly) and paths generated in fixed-size chunks so memory does
+  not grow with the path count.
+* :func:`binomial_price` - Cox-Ross-Rubinstein tree for European or American
+  exercise, using one O(N) array for backward induction.
+"""
+import math
+
+from bs_model import np
+
+
+def mc_price(S: float, K: float, T: float, r: float, sigma: float, option: str,
+             paths: int = 1_000_000, antithetic: bool = True, control: bool = True,
+             chunk_size: int = 100_000, seed=None) -> tuple:
+    """Monte Carlo price of a European option as ``(price, standard_error)``.
+
+    ``seed`` is passed to ``numpy.random.default_rng`` (or may be a
+    ``Generator``) so runs are reproducible.
+    """
+    if np is None:
+        raise ImportError("numpy is required for mc_price")
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return 0.0, 0.0
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    drift = (r - 0.5 * sigma**2) * T
+    vol = sigma * math.sqrt(T)
+    disc = math.exp(-r * T)
+    sign = 1.0 if option == "Call" else -1.0
+    # running sums of payoff y, control x, and their products
+    n = sy = sx = syy = sxx = sxy = 0.0
+    remaining = paths
+    while remaining > 0:
+        m = min(chunk_size, remaining)
+        if antithetic:
+            z = rng.standard_normal((m + 1) // 2)
+            z = np.concatenate([z, -z])
+        else:
+            z = rng.standard_normal(m)
+        remaining -= len(z)
+        ST = S * np.exp(drift + vol * z)
+        y = disc * np.maximum(sign * (ST - K), 0.0)
+        if antithetic:
+            # average each path with its mirror so samples stay independent
+            half = len(z) // 2
+            y = 0.5 * (y[:half] + y[half:])
+            ST = 0.5 * (ST[:half] + ST[half:])
+        x = disc * ST
+        n += len(y)
+        sy += y.sum()
+        sx += x.sum()
+        syy += (y * y).sum()
+        sxx += (x * x).sum()
+        sxy += (x * y).sum()
+    if n == 0:
+        raise ValueError("paths must be positive")
+    mean_y, mean_x = sy / n, sx / n
+    var_y = syy / n - mean_y**2
+    if not control:
+        return float(mean_y), math.sqrt(max(var_y, 0.0) / n)
+    var_x = sxx / n - mean_x**2
+    cov = sxy / n - mean_x * mean_y
+    beta = cov / var_x if var_x > 0 else 0.0
+    # E[disc * S_T] = S under the risk-neutral measure
+    price = mean_y - beta * (mean_x - S)
+    resid = var_y - beta * cov
+    return float(price), math.sqrt(max(resid, 0.0) / n)
+
+
+def binomial_price(S: float, K: float, T: float, r: float, sigma: float, option: str,
+                   steps: int = 500, american: bool = False) -> float:
+    """Cox-Ross-Rubinstein binomial price; ``american`` allows early exercise."""
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return 0.0
+    dt = T / steps
+    u = math.exp(sigma * math.sqrt(dt))
+    d = 1.0 / u
+    growth = math.exp(r * dt)
+    p = (growth - d) / (u - d)
+    if not 0.0 < p < 1.0:
+        raise ValueError("steps too small for these parameters (risk-neutral probability outside (0, 1))")
+    disc_p, disc_q = p / growth, (1.0 - p) / growth
+    sign = 1.0 if option == "Call" else -1.0
+    if np is None:
+        return _binomial_py(S, K, steps, u, d, disc_p, disc_q, sign, american)
+    spots = S * u ** np.arange(steps, -steps - 1, -2, dtype=float)
+    values = np.maximum(sign * (spots - K), 0.0)
+    for _ in range(steps):
+        values = disc_p * values[:-1] + disc_q * values[1:]
+        if american:
+            spots = spots[:-1] * d
+            np.maximum(values, sign * (spots - K), out=values)
+    return float(values[0])
+
+
+def _binomial_py(S, K, steps, u, d, disc_p, disc_q, sign, american):
+    spots = [S * u ** (steps - 2 * i) for i in range(steps + 1)]
+    values = [max(sign * (s - K), 0.0) for s in spots]
+    for n in range(steps, 0, -1):
+        for i in range(n):
+            values[i] = disc_p * values[i] + disc_q * values[i + 1]
+            if american:
+                spots[i] *= d
+                values[i] = max(values[i], sign * (spots[i] - K))
+    return values[0]
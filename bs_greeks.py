@@ -0,0 +1,124 @@
+# coding: utf-8
+"""Black-Scholes Greeks and implied volatility.
+
+All Greeks are computed in one pass from the shared ``d1``/``d2`` terms.
+Vega and rho are per unit (1.0 = 100%) change of volatility and rate, theta
+is per year.
+"""
+import math
+
+from bs_model import bs_price, cnd, cnd_vec, np
+
+GREEKS = ("price", "delta", "gamma", "vega", "theta", "rho")
+
+
+def greeks(S: float, K: float, T: float, r: float, sigma: float, option: str) -> dict:
+    """Price and Greeks of a single option as a dict keyed by ``GREEKS``."""
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return dict.fromkeys(GREEKS, 0.0)
+    sign = 1.0 if option == "Call" else -1.0
+    sqrt_t = math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    pdf = math.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+    disc = K * math.exp(-r * T)
+    n1, n2 = cnd(sign * d1), cnd(sign * d2)
+    return {
+        "price": bs_price(S, K, T, r, sigma, option),
+        "delta": sign * n1,
+        "gamma": pdf / (S * sigma * sqrt_t),
+        "vega": S * pdf * sqrt_t,
+        "theta": -S * pdf * sigma / (2.0 * sqrt_t) - sign * r * disc * n2,
+        "rho": sign * T * disc * n2,
+    }
+
+
+def greeks_vec(S, K, T, r, sigma, is_call=True, backend: str | None = None) -> dict:
+    """Array version of :func:`greeks`; inputs broadcast like ``bs_price_vec``.
+
+    ``backend`` selects the normal CDF (see :func:`bs_model.cnd_vec`).
+    """
+    if np is None:
+        raise ImportError("numpy is required for greeks_vec")
+    S, K, T, r, sigma = (np.asarray(v, dtype=float) for v in (S, K, T, r, sigma))
+    sign = np.where(is_call, 1.0, -1.0)
+    valid = (T > 0) & (sigma > 0) & (S > 0) & (K > 0)
+    with np.errstate(all="ignore"):
+        sqrt_t = np.sqrt(T)
+        vol = sigma * sqrt_t
+        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / vol
+        d2 = d1 - vol
+        pdf = np.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+        disc = K * np.exp(-r * T)
+        n1, n2 = cnd_vec(sign * d1, backend), cnd_vec(sign * d2, backend)
+        out = {
+            "price": sign * (S * n1 - disc * n2),
+            "delta": sign * n1,
+            "gamma": pdf / (S * vol),
+            "vega": S * pdf * sqrt_t,
+            "theta": -S * pdf * sigma / (2.0 * sqrt_t) - sign * r * disc * n2,
+            "rho": sign * T * disc * n2,
+        }
+    return {k: np.where(valid, v, 0.0) for k, v in out.items()}
+
+
+def implied_vol(price, S, K, T, r, is_call=True, tol=1e-8, max_iter=100, lo=1e-6, hi=5.0,
+                backend: str | None = None):
+    """Volatilities that reproduce ``price``, solved for a whole chain at once.
+
+    Each element runs Newton steps on vega inside its own ``[lo, hi]``
+    bracket; a step that leaves the bracket (or has a vanishing vega) is
+    replaced by bisection.  Returns ``(sigma, converged)``; elements whose
+    price is outside the no-arbitrage range or that do not converge within
+    ``max_iter`` are ``nan`` with ``converged`` False.  ``backend`` selects
+    the normal CDF used for repricing.
+    """
+    if np is None:
+        raise ImportError("numpy is required for implied_vol")
+    values = [np.asarray(v, dtype=float) for v in (price, S, K, T, r)] + [np.asarray(is_call, dtype=bool)]
+    shape = np.broadcast_shapes(*(v.shape for v in values))
+    price, S, K, T, r, call = (np.broadcast_to(v, shape).ravel() for v in values)
+    lo_b = np.full(price.shape, lo)
+    hi_b = np.full(price.shape, hi)
+    with np.errstate(all="ignore"):
+        disc = K * np.exp(-r * T)
+        lower = np.where(call, np.maximum(S - disc, 0.0), np.maximum(disc - S, 0.0))
+        upper = np.where(call, S, disc)
+    ok = (T > 0) & (S > 0) & (K > 0) & (price > lower) & (price < upper)
+    ok &= _price_vega(lo_b, S, K, T, r, call, backend)[0] <= price
+    ok &= _price_vega(hi_b, S, K, T, r, call, backend)[0] >= price
+    # Brenner-Subrahmanyam approximation as the starting point, if inside the bracket
+    with np.errstate(all="ignore"):
+        guess = np.sqrt(2.0 * np.pi / T) * price / S
+    sigma = np.where((guess > lo) & (guess < hi), guess, 0.5 * (lo + hi))
+    converged = ~ok
+    for _ in range(max_iter):
+        idx = np.flatnonzero(~converged)
+        if idx.size == 0:
+            break
+        s, l, h = sigma[idx], lo_b[idx], hi_b[idx]
+        p, vega = _price_vega(s, S[idx], K[idx], T[idx], r[idx], call[idx], backend)
+        diff = p - price[idx]
+        l = np.where(diff < 0, s, l)
+        h = np.where(diff > 0, s, h)
+        with np.errstate(all="ignore"):
+            newton = s - diff / vega
+        bisect = ~np.isfinite(newton) | (newton <= l) | (newton >= h)
+        sigma[idx] = np.where(bisect, 0.5 * (l + h), newton)
+        lo_b[idx], hi_b[idx] = l, h
+        converged[idx] = (np.abs(diff) < tol) | (h - l < tol)
+        sigma[idx] = np.where(np.abs(diff) < tol, s, sigma[idx])
+    converged &= ok
+    return np.where(converged, sigma, np.nan).reshape(shape), converged.reshape(shape)
+
+
+def _price_vega(sigma, S, K, T, r, call, backend=None):
+    with np.errstate(all="ignore"):
+        sqrt_t = np.sqrt(T)
+        vol = sigma * sqrt_t
+        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / vol
+        d2 = d1 - vol
+        sign = np.where(call, 1.0, -1.0)
+        price = sign * (S * cnd_vec(sign * d1, backend) - K * np.exp(-r * T) * cnd_vec(sign * d2, backend))
+        vega = S * np.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi) * sqrt_t
+    return price, vega
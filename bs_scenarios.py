@@ -0,0 +1,77 @@
+# coding: utf-8
+"""Scenario (spot x vol x rate shock) revaluation of option portfolios.
+
+``portfolio`` is any mapping of columns - a dict of arrays or a pandas
+DataFrame - with ``S, K, T, r, sigma, type`` (``Call``/``Put``) and an
+optional ``quantity`` (default 1).  Spot shocks are relative (``-0.1`` is a
+10% fall), vol and rate shocks are absolute additions::
+
+    pnl = scenario_pnl(book, spot=np.linspace(-0.2, 0.2, 21), vol=[-0.05, 0, 0.05], rate=[0, 0.01])
+    pnl.shape   # (21, 3, 2): portfolio P&L per scenario
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from bs_model import bs_price_vec, np
+
+COLUMNS = ("S", "K", "T", "r", "sigma", "type")
+MIN_VOL = 1e-6  # shocked volatilities are floored here rather than going to zero
+
+
+def scenario_pnl(portfolio, spot=(0.0,), vol=(0.0,), rate=(0.0,), max_cells=4_000_000, workers=1,
+                 backend=None):
+    """Aggregated P&L of ``portfolio`` for every (spot, vol, rate) shock.
+
+    Positions are revalued against the whole scenario grid by broadcasting, in
+    chunks of positions sized so that at most ``max_cells`` position x
+    scenario values exist at once.  With ``workers > 1`` chunks are spread
+    over a process pool.  Returns an array of shape
+    ``(len(spot), len(vol), len(rate))``.
+    """
+    if np is None:
+        raise ImportError("numpy is required for scenario_pnl")
+    book = _columns(portfolio)
+    shocks = tuple(np.asarray(s, dtype=float).ravel() for s in (spot, vol, rate))
+    n_scen = shocks[0].size * shocks[1].size * shocks[2].size
+    step = max(1, max_cells // max(n_scen, 1))
+    n = book["S"].size
+    chunks = [{k: v[i:i + step] for k, v in book.items()} for i in range(0, n, step)]
+    total = np.zeros(tuple(s.size for s in shocks))
+    if workers and workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, os.cpu_count() or 1, len(chunks))) as pool:
+            for part in pool.map(_chunk_pnl, chunks, [shocks] * len(chunks), [backend] * len(chunks)):
+                total += part
+    else:
+        for chunk in chunks:
+            total += _chunk_pnl(chunk, shocks, backend)
+    return total
+
+
+def _columns(portfolio):
+    book = {name: np.asarray(portfolio[name], dtype=float) for name in COLUMNS[:-1]}
+    book["call"] = np.asarray(portfolio["type"]) == "Call"
+    try:
+        quantity = portfolio["quantity"]
+    except KeyError:
+        quantity = np.ones_like(book["S"])
+    book["quantity"] = np.asarray(quantity, dtype=float)
+    return book
+
+
+def _chunk_pnl(chunk, shocks, backend=None):
+    """P&L of one chunk of positions summed over positions (runs in workers)."""
+    spot, vol, rate = shocks
+    q = chunk["quantity"]
+    base = bs_price_vec(chunk["S"], chunk["K"], chunk["T"], chunk["r"], chunk["sigma"], chunk["call"], backend)
+    # axes: position, spot, vol, rate
+    col = (slice(None), None, None, None)
+    shocked = bs_price_vec(
+        chunk["S"][col] * (1.0 + spot[None, :, None, None]),
+        chunk["K"][col],
+        chunk["T"][col],
+        chunk["r"][col] + rate[None, None, None, :],
+        np.maximum(chunk["sigma"][col] + vol[None, None, :, None], MIN_VOL),
+        chunk["call"][col],
+        backend,
+    )
+    return np.tensordot(q, shocked - base[col], axes=(0, 0))
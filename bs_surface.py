@@ -0,0 +1,90 @@
+# coding: utf-8
+"""Precomputed Black-Scholes price/Greeks surfaces for interactive use.
+
+A :class:`PriceSurface` holds prices and Greeks on a regular (S, sigma, T)
+grid for one strike, rate and option type and answers queries by trilinear
+interpolation.  :class:`SurfaceCache` builds surfaces on a background thread
+and drops the current one whenever K, r or the option type change.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bs_greeks import greeks_vec
+from bs_model import np
+
+
+class PriceSurface:
+    def __init__(self, K: float, r: float, option: str, S_range=(50.0, 150.0), sigma_range=(0.05, 0.5),
+                 T_range=(0.1, 2.0), shape=(61, 46, 40)):
+        if np is None:
+            raise ImportError("numpy is required for PriceSurface")
+        self.key = (K, r, option)
+        self.axes = [np.linspace(lo, hi, n) for (lo, hi), n in zip((S_range, sigma_range, T_range), shape)]
+        S, sigma, T = np.meshgrid(*self.axes, indexing="ij")
+        self.values = greeks_vec(S, K, T, r, sigma, option == "Call")
+
+    def matches(self, K: float, r: float, option: str) -> bool:
+        return self.key == (K, r, option)
+
+    def query(self, S, sigma, T, field: str = "price"):
+        """Interpolate ``field`` at the given points (scalars or arrays).
+
+        Points outside the grid are clamped to its edge.
+        """
+        grid = self.values[field]
+        idx, w = zip(*(self._locate(ax, v) for ax, v in zip(self.axes, np.broadcast_arrays(S, sigma, T))))
+        (i, j, k), (wi, wj, wk) = idx, w
+        out = 0.0
+        for di, fi in ((0, 1 - wi), (1, wi)):
+            for dj, fj in ((0, 1 - wj), (1, wj)):
+                for dk, fk in ((0, 1 - wk), (1, wk)):
+                    out = out + fi * fj * fk * grid[i + di, j + dj, k + dk]
+        return out
+
+    def slice_T(self, T: float, field: str = "price"):
+        """The (S, sigma) plane of ``field`` at maturity ``T``."""
+        k, w = self._locate(self.axes[2], np.asarray(T))
+        grid = self.values[field]
+        return (1 - w) * grid[:, :, k] + w * grid[:, :, k + 1]
+
+    @staticmethod
+    def _locate(axis, v):
+        v = np.clip(np.asarray(v, dtype=float), axis[0], axis[-1])
+        i = np.clip(np.searchsorted(axis, v, side="right") - 1, 0, len(axis) - 2)
+        return i, (v - axis[i]) / (axis[i + 1] - axis[i])
+
+
+class SurfaceCache:
+    """Build surfaces in the background for the current K, r and option type.
+
+    :meth:`get` never blocks: it returns the ready surface for the key, or
+    ``None`` while one is being computed.  If the build failed, ``get``
+    re-raises its exception until the key changes.
+    """
+
+    def __init__(self, **grid):
+        self.grid = grid
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+        self._key = None
+        self._future = None
+
+    def get(self, K: float, r: float, option: str):
+        key = (K, r, option)
+        with self._lock:
+            if self._key != key:
+                self.invalidate()
+                self._key = key
+                self._future = self._pool.submit(PriceSurface, K, r, option, **self.grid)
+            if self._future.done():
+                return self._future.result()
+        return None
+
+    def invalidate(self) -> None:
+        """Forget the current surface (a running build is discarded)."""
+        if self._future is not None:
+            self._future.cancel()
+        self._key = self._future = None
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
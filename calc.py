@@ -1,8 +1,324 @@
-﻿import json
+﻿import atexit
+import contextlib
+import datetime
+import functools
+import itertools
+import json
+import os
 import pathlib
+import sqlite3
+import weakref
+from journal import append_lines, rewrite_lines
+try:
+    import fcntl
+except ModuleNotFoundError:  # pragma: no cover - Windows
+    fcntl = None
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
 ROOT = pathlib.Path(__file__).resolve().parent
-_HISTORY = ROOT / "history.json"
+# テストなどで別の場所に書かせたいときは環境変数 CALC_HISTORY で差し替える
+_HISTORY = pathlib.Path(os.environ.get("CALC_HISTORY") or ROOT / "history.jsonl")
+# buffer_size 付きのストア。終了時に 1 つの atexit フックでまとめて flush する。
+# 弱参照で持つので、使い終わったストアが終了まで生き残ることはない
+_BUFFERED = weakref.WeakSet()
+@atexit.register
+def _flush_buffered():
+    for store in list(_BUFFERED):
+        store.flush()
+def _dumps(record):
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+def _timestamp(record):
+    # dedupe でまとめたレコードは最後に現れた時刻で絞り込む
+    ts = record.get("last_ts") or record.get("ts")
+    return datetime.datetime.fromisoformat(ts) if ts else datetime.datetime.min
+class JsonlHistory:
+    """1 行 1 レコードの追記専用履歴 (JSON Lines)。
+
+    旧形式の history.json (JSON 配列) があれば初回アクセス時に一度だけ変換する。
+    書き込みは <path>.lock の排他ロック下で行い、ログ全体の書き直しは
+    一時ファイル + fsync + os.replace で原子的に置き換えるので、複数プロセスから
+    同時に使っても記録は失われない。buffer_size を指定すると、その件数が
+    たまるか flush() されるまで追記をまとめて 1 回の書き込みにする。
+    dedupe=True なら同じ (op, a, b) のレコードを 1 件にまとめ、回数を count、
+    最後に現れた時刻を last_ts に持つ (書き込み単位でまとめ、ログ全体は
+    compact() でまとめる)。since の絞り込みは last_ts を見る。
+    """
+    def __init__(self, path=None, legacy=None, buffer_size=0, dedupe=False):
+        self.path = pathlib.Path(path) if path is not None else _HISTORY
+        self.legacy = pathlib.Path(legacy) if legacy is not None else self.path.with_suffix(".json")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.buffer_size = buffer_size
+        self.dedupe = dedupe
+        self._buffer = []
+        if buffer_size:
+            _BUFFERED.add(self)
+    def __del__(self):
+        # 参照が無くなったストアのバッファも捨てずに書き出す
+        if getattr(self, "_buffer", None):
+            self.flush()
+    def append(self, records):
+        """レコードを末尾に追記する。履歴の件数に依らず O(1)"""
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+    def flush(self):
+        """バッファ中のレコードを 1 回の書き込み + fsync でログに追記する"""
+        if not self._buffer:
+            return
+        records = _merge_repeats(self._buffer) if self.dedupe else self._buffer
+        data = "".join(_dumps(r) + "\n" for r in records).encode("utf-8")
+        with self._locked():
+            self._migrate()
+            append_lines(self.path, data)
+        self._buffer = []
+    def __iter__(self):
+        self._prepare()
+        for line, record in self._read():
+            if record is not None:
+                yield record
+    def select(self, op=None, since=None, offset=0, limit=None):
+        """条件に合うレコードを先頭から 1 件ずつ返す"""
+        records = iter(self)
+        if op is not None:
+            records = (r for r in records if r.get("op") == op)
+        if since is not None:
+            records = (r for r in records if _timestamp(r) >= since)
+        stop = None if limit is None else offset + limit
+        return itertools.islice(records, offset, stop)
+    def stats(self, op=None, since=None):
+        """op ごとの件数と結果の合計・最小・最大・平均"""
+        return _aggregate(self.select(op=op, since=since))
+    def records(self):
+        """全レコードのリスト。壊れた行があれば compact() で取り除く"""
+        self._prepare()
+        result, damaged = [], False
+        for line, record in self._read():
+            if record is not None:
+                result.append(record)
+            elif line.strip():
+                damaged = True
+        if damaged:
+            self.compact()
+            return list(self)
+        return result
+    def compact(self):
+        """空行や書き込み途中で壊れた行を除いてログを書き直す。dedupe なら重複もまとめる"""
+        self.flush()
+        with self._locked():
+            self._migrate()
+            if self.path.exists():
+                records = (r for _, r in self._read() if r is not None)
+                self._rewrite(_merge_repeats(records) if self.dedupe else records)
+    def _prepare(self):
+        self.flush()
+        if self.legacy.exists():
+            with self._locked():
+                self._migrate()
+    @contextlib.contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    @staticmethod
+    def _parse(line):
+        if not line.strip():
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+    def _rewrite(self, records):
+        """一時ファイルに書いて fsync してから原子的に置き換える (ロック下で呼ぶ)"""
+        rewrite_lines(self.path, (_dumps(r) + "\n" for r in records))
+    def _migrate(self):
+        # ロック下で呼ぶこと
+        if not self.legacy.exists():
+            return
+        records = json.loads(self.legacy.read_text(encoding="utf-8") or "[]")
+        records.extend(r for _, r in self._read() if r is not None)
+        self._rewrite(records)
+        self.legacy.unlink()
+    def _read(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                yield line, self._parse(line)
+class SqliteHistory:
+    """SQLite に保存する履歴。JsonlHistory と同じインターフェースを持つ。
+
+    op と ts に索引を張り、絞り込みや集計 (stats) は SQL 側で行う。
+    追記は 1 トランザクションでまとめて INSERT する。dedupe=True なら既存の
+    同じ (op, a, b) の行の count を増やし、last_ts を更新する。since の
+    絞り込みは last_ts (まとめていない行では ts と同じ) を見る。
+    """
+    def __init__(self, path, buffer_size=0, dedupe=False):
+        self.path = pathlib.Path(path)
+        self.buffer_size = buffer_size
+        self.dedupe = dedupe
+        self._buffer = []
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY, op TEXT NOT NULL, a, b, result, ts TEXT,
+                    count INTEGER NOT NULL DEFAULT 1, last_ts TEXT);
+                CREATE INDEX IF NOT EXISTS history_op_ts ON history (op, ts);
+                CREATE INDEX IF NOT EXISTS history_ts ON history (ts);
+            """)
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(history)")]
+            if "count" not in columns:
+                self._conn.execute("ALTER TABLE history ADD COLUMN count INTEGER NOT NULL DEFAULT 1")
+            if "last_ts" not in columns:
+                self._conn.execute("ALTER TABLE history ADD COLUMN last_ts TEXT")
+                self._conn.execute("UPDATE history SET last_ts = ts")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS history_last_ts ON history (last_ts)")
+            if dedupe:
+                self._conn.execute("CREATE INDEX IF NOT EXISTS history_key ON history (op, a, b)")
+        if buffer_size:
+            _BUFFERED.add(self)
+    def __del__(self):
+        # 参照が無くなったストアのバッファも捨てずに書き出す
+        if getattr(self, "_buffer", None):
+            self.flush()
+    def append(self, records):
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+    def flush(self):
+        if not self._buffer:
+            return
+        with self._conn:
+            records = self._buffer
+            if self.dedupe:
+                records = [r for r in _merge_repeats(records) if not self._bump(r)]
+            self._conn.executemany(
+                "INSERT INTO history (op, a, b, result, ts, count, last_ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((r["op"], r["a"], r["b"], r["result"], r.get("ts"), r.get("count", 1), r.get("last_ts") or r.get("ts"))
+                 for r in records))
+        self._buffer = []
+    def _bump(self, record):
+        """同じ (op, a, b) の既存行があれば count を足し last_ts を進めて True を返す"""
+        cur = self._conn.execute(
+            "UPDATE history SET count = count + ?, last_ts = MAX(COALESCE(last_ts, ''), COALESCE(?, ''))"
+            " WHERE id = (SELECT id FROM history WHERE op = ? AND a = ? AND b = ? ORDER BY id LIMIT 1)",
+            (record.get("count", 1), record.get("last_ts") or record.get("ts"), record["op"], record["a"], record["b"]))
+        return cur.rowcount > 0
+    def __iter__(self):
+        return self.select()
+    def select(self, op=None, since=None, offset=0, limit=None):
+        self.flush()
+        where, params = self._where(op, since)
+        cur = self._conn.execute(
+            f"SELECT op, a, b, result, ts, count, last_ts FROM history{where} ORDER BY id LIMIT ? OFFSET ?",
+            (*params, -1 if limit is None else limit, offset))
+        return (self._record(row) for row in cur)
+    def stats(self, op=None, since=None):
+        self.flush()
+        where, params = self._where(op, since)
+        cur = self._conn.execute(
+            "SELECT op, SUM(count), SUM(result * count), MIN(result), MAX(result),"
+            " SUM(result * count) * 1.0 / SUM(count)"
+            f" FROM history{where} GROUP BY op ORDER BY op", params)
+        return [dict(zip(("op", "count", "sum", "min", "max", "avg"), row)) for row in cur]
+    def records(self):
+        return list(self)
+    def compact(self):
+        self.flush()
+        self._conn.execute("VACUUM")
+    @staticmethod
+    def _where(op, since):
+        clauses, params = [], []
+        if op is not None:
+            clauses.append("op = ?")
+            params.append(op)
+        if since is not None:
+            clauses.append("last_ts >= ?")
+            params.append(since.isoformat())
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    @staticmethod
+    def _record(row):
+        op, a, b, result, ts, count, last_ts = row
+        record = {"op": op, "a": a, "b": b, "result": result}
+        if ts is not None:
+            record["ts"] = ts
+        if count != 1:
+            record["count"] = count
+        if last_ts and last_ts != ts:
+            record["last_ts"] = last_ts
+        return record
+def _merge_repeats(records):
+    """(op, a, b) が同じレコードを最初の 1 件にまとめ、回数を count、最後の時刻を last_ts に持たせる"""
+    merged = {}
+    for r in records:
+        key = (r["op"], r["a"], r["b"])
+        first = merged.get(key)
+        if first is None:
+            merged[key] = dict(r)
+        else:
+            first["count"] = first.get("count", 1) + r.get("count", 1)
+            last = max(first.get("last_ts") or first.get("ts") or "", r.get("last_ts") or r.get("ts") or "")
+            if last and last != first.get("ts"):
+                first["last_ts"] = last
+    return list(merged.values())
+def _aggregate(records):
+    """stats() と同じ形の集計を Python 側で行う (JsonlHistory 用)"""
+    acc = {}
+    for r in records:
+        s = acc.get(r["op"])
+        if s is None:
+            s = acc[r["op"]] = {"op": r["op"], "count": 0, "sum": 0, "min": r["result"], "max": r["result"]}
+        n = r.get("count", 1)
+        s["count"] += n
+        s["sum"] += r["result"] * n
+        s["min"] = min(s["min"], r["result"])
+        s["max"] = max(s["max"], r["result"])
+    for s in acc.values():
+        s["avg"] = s["sum"] / s["count"]
+    return [acc[op] for op in sorted(acc)]
+def _pow_or_none(a, b):
+    if b <= 0:
+        return None
+    try:
+        r = a ** b
+    except OverflowError:
+        return float("inf")
+    return None if isinstance(r, complex) else r
+_PY_OPS = {
+    "add": lambda a, b: a + b,
+    "sub": lambda a, b: a - b,
+    "mul": lambda a, b: a * b,
+    "div": lambda a, b: a / b if b != 0 else None,
+    "pow": _pow_or_none,
+}
+_BATCH_OPS = {} if np is None else {
+    "add": np.add, "sub": np.subtract, "mul": np.multiply, "div": np.divide, "pow": np.power,
+}
+def _batch_py(op, a, b):
+    """NumPy が無い環境向けの batch 実装"""
+    if not isinstance(a, (list, tuple)):
+        a = [a] * (len(b) if isinstance(b, (list, tuple)) else 1)
+    if not isinstance(b, (list, tuple)):
+        b = [b] * len(a)
+    if len(a) != len(b):
+        raise ValueError("a と b の長さが一致しません")
+    fn = _PY_OPS[op]
+    result = [fn(float(x), float(y)) for x, y in zip(a, b)]
+    valid = [r is not None for r in result]
+    return [float("nan") if r is None else r for r in result], valid
 class Calculator:
+    def __init__(self, store=None, cache_size=0):
+        """cache_size > 0 なら compute() の結果を (op, a, b) をキーに LRU で最大その件数覚える"""
+        self.store = store if store is not None else JsonlHistory()
+        self._cached = functools.lru_cache(maxsize=cache_size, typed=True)(self._apply) if cache_size else None
     def add(self, a, b): return a + b
     def sub(self, a, b): return a - b
     def mul(self, a, b): return a * b
@@ -15,17 +331,62 @@ class Calculator:
         if b <= 0:
             raise ValueError("指数は正の数でなければなりません")
         return a ** b
+    def compute(self, op, a, b):
+        """演算名で計算する。キャッシュが有効ならまずそこを引く"""
+        if op not in _PY_OPS:
+            raise ValueError(f"未知の演算です: {op}")
+        if self._cached is not None:
+            return self._cached(op, a, b)
+        return self._apply(op, a, b)
+    def _apply(self, op, a, b):
+        return getattr(self, op)(a, b)
+    def cache_info(self):
+        """キャッシュのヒット・ミス数など (functools の CacheInfo)。無効なら None"""
+        return self._cached.cache_info() if self._cached is not None else None
+    def cache_clear(self):
+        if self._cached is not None:
+            self._cached.cache_clear()
+    def batch(self, op, a, b):
+        """配列同士 (スカラーはブロードキャスト) で op をまとめて計算する。
+
+        (結果, 有効マスク) を返す。ゼロ除算や正でない指数は例外にせず、
+        その要素を nan・マスク False にする。NumPy が無ければリストで返す。
+        """
+        if op not in _PY_OPS:
+            raise ValueError(f"未知の演算です: {op}")
+        if np is None:
+            return _batch_py(op, a, b)
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        shape = np.broadcast_shapes(a.shape, b.shape)
+        if op == "div":
+            valid = np.broadcast_to(b != 0, shape)
+        elif op == "pow":
+            valid = np.broadcast_to(b > 0, shape)
+        else:
+            valid = np.ones(shape, dtype=bool)
+        result = np.full(shape, np.nan)
+        with np.errstate(all="ignore"):
+            _BATCH_OPS[op](a, b, out=result, where=valid)
+        if op == "pow":
+            # 負の底に非整数の指数など、実数にならない要素も無効とする
+            valid = valid & ~np.isnan(result)
+        return result, valid
     def save(self, op, a, b, result):
-        record = {"op": op, "a": a, "b": b, "result": result}
-        history = []
-        if _HISTORY.exists():
-            history = json.loads(_HISTORY.read_text(encoding="utf-8"))
-        history.append(record)
-        _HISTORY.write_text(
-            json.dumps(history, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
+        self.save_many([(op, a, b, result)])
+    def save_many(self, rows):
+        """(op, a, b, result) の並びを 1 回の書き込みで履歴に追加する"""
+        ts = datetime.datetime.now().isoformat(timespec="seconds")
+        self.store.append({"op": op, "a": a, "b": b, "result": result, "ts": ts}
+                          for op, a, b, result in rows)
+    def flush(self):
+        """バッファ中の履歴をストアに書き出す"""
+        self.store.flush()
     def history(self):
-        if _HISTORY.exists():
-            return json.loads(_HISTORY.read_text(encoding="utf-8"))
-        return []
\ No newline at end of file
+        return self.store.records()
+    def stats(self, op=None, since=None):
+        """op ごとの件数と結果の合計・最小・最大・平均をリストで返す"""
+        return self.store.stats(op=op, since=since)
+    def iter_history(self, op=None, since=None, offset=0, limit=None):
+        """履歴を 1 件ずつ返すジェネレータ。since は datetime で、それ以降の記録のみ"""
+        yield from self.store.select(op=op, since=since, offset=offset, limit=limit)
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Arithmetic expressions on top of :class:`calc.Calculator`.
+
+``compile_expr("(a*b)+c/d")`` parses the text once into a small postfix
+program (cached by text) that can be run on scalars or on whole columns::
+
+    expr = compile_expr("(a*b)+c/d")
+    expr.evaluate({"a": 2, "b": 3, "c": 1, "d": 4})      # 6.25
+    result, valid = expr.evaluate_columns({"a": [...], ...})
+
+Column evaluation goes through :meth:`Calculator.batch`, so it is vectorized
+when NumPy is installed and invalid rows (division by zero, non-positive
+exponents) are reported in the mask instead of raising.
+"""
+import ast
+import functools
+
+from calc import Calculator, np
+
+_BINOPS = {ast.Add: "add", ast.Sub: "sub", ast.Mult: "mul", ast.Div: "div", ast.Pow: "pow"}
+
+
+class Expression:
+    def __init__(self, text: str, program: tuple, names: tuple):
+        self.text = text
+        self.program = program
+        self.names = names
+
+    def __repr__(self) -> str:
+        return f"Expression({self.text!r})"
+
+    def evaluate(self, env: dict, calc: Calculator | None = None):
+        """Evaluate for one row of scalars. Invalid operations raise ValueError."""
+        calc = calc or Calculator()
+        return self._run(env, lambda op, a, b: calc.compute(op, a, b), lambda x: -x)
+
+    def evaluate_columns(self, columns: dict, calc: Calculator | None = None):
+        """Evaluate over equal-length columns and return ``(result, valid)``."""
+        calc = calc or Calculator()
+        masks = []
+
+        def binop(op, a, b):
+            result, valid = calc.batch(op, a, b)
+            masks.append(valid)
+            return result
+
+        def neg(x):
+            if np is not None:
+                return np.negative(x)
+            return [-v for v in x] if isinstance(x, list) else -x
+
+        result = self._run(columns, binop, neg)
+        n = len(next(iter(columns.values()))) if columns else 1
+        if np is not None:
+            result = np.broadcast_to(np.asarray(result, dtype=float), (n,))
+            valid = np.ones(n, dtype=bool)
+            for m in masks:
+                valid &= m
+            return result, valid
+        if not isinstance(result, list):
+            result = [result] * n
+        valid = [all(m[i] for m in masks) for i in range(len(result))]
+        return result, valid
+
+    def _run(self, env, binop, neg):
+        stack = []
+        for kind, arg in self.program:
+            if kind == "const":
+                stack.append(arg)
+            elif kind == "load":
+                try:
+                    stack.append(env[arg])
+                except KeyError:
+                    raise ValueError(f"undefined variable: {arg}") from None
+            elif kind == "neg":
+                stack.append(neg(stack.pop()))
+            else:
+                b = stack.pop()
+                stack.append(binop(arg, stack.pop(), b))
+        return stack[0]
+
+
+@functools.lru_cache(maxsize=256)
+def compile_expr(text: str) -> Expression:
+    """Parse ``text`` into an :class:`Expression`; repeated texts hit a cache."""
+    try:
+        tree = ast.parse(text, mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"invalid expression: {text!r}") from e
+    program, names = [], []
+    _emit(tree, program, names)
+    return Expression(text, tuple(program), tuple(names))
+
+
+def _emit(node, program, names) -> None:
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        _emit(node.left, program, names)
+        _emit(node.right, program, names)
+        program.append(("op", _BINOPS[type(node.op)]))
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        _emit(node.operand, program, names)
+        if isinstance(node.op, ast.USub):
+            program.append(("neg", None))
+    elif isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        program.append(("const", node.value))
+    elif isinstance(node, ast.Name):
+        if node.id not in names:
+            names.append(node.id)
+        program.append(("load", node.id))
+    else:
+        raise ValueError(f"unsupported syntax in expression: {ast.dump(node)}")
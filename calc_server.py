@@ -0,0 +1,122 @@
+"""Long-lived calculator server for ``cli.py --serve``.
+
+One JSON object per line over a Unix-domain socket.  Requests look like
+``{"op": "add", "a": 1, "b": 2}`` and are answered with ``{"result": 3}`` or
+``{"error": "..."}``.  History records are kept in memory and written to the
+store in one append every ``interval`` seconds (group commit).
+"""
+import asyncio
+import datetime
+import json
+import math
+import os
+import socket
+
+from calc import Calculator
+
+OPS = ("add", "sub", "mul", "div", "pow")
+
+
+def _finite_real(value):
+    if isinstance(value, complex):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:
+        return False
+
+
+class CalcServer:
+    def __init__(self, path, calc=None, interval=0.5):
+        self.path = str(path)
+        self.calc = calc if calc is not None else Calculator()
+        self.interval = interval
+        self._pending = []
+        self._stop = None
+
+    def handle(self, request: dict) -> dict:
+        """Answer a single decoded request."""
+        op = request.get("op")
+        if op in OPS:
+            a, b = request.get("a"), request.get("b")
+            if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (a, b)):
+                return {"error": "operands a and b must be numbers"}
+            try:
+                result = self.calc.compute(op, a, b)
+            except (TypeError, ValueError, ArithmeticError) as e:
+                return {"error": str(e)}
+            if not _finite_real(result):
+                # complex results and ints too large for a float cannot be sent or stored
+                return {"error": f"result of {op} is not a finite real number"}
+            self._pending.append((op, a, b, result))
+            return {"result": result}
+        if op == "list":
+            self.flush()
+            since = request.get("since")
+            records = self.calc.iter_history(
+                op=request.get("filter"), since=since and datetime.datetime.fromisoformat(since),
+                offset=request.get("offset", 0), limit=request.get("limit"))
+            return {"records": list(records)}
+        if op == "cache":
+            info = self.calc.cache_info()
+            return {"cache": info and info._asdict()}
+        if op == "flush":
+            self.flush()
+            return {"ok": True}
+        if op == "shutdown":
+            self._stop.set()
+            return {"ok": True}
+        return {"error": f"unknown op: {op}"}
+
+    def flush(self) -> None:
+        """Write every pending record with a single store append."""
+        if self._pending:
+            rows, self._pending = self._pending, []
+            self.calc.save_many(rows)
+
+    async def _client(self, reader, writer) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    response = self.handle(json.loads(line))
+                except (ValueError, AttributeError):
+                    response = {"error": "invalid request"}
+                writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _committer(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    async def serve(self) -> None:
+        self._stop = asyncio.Event()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self._client, path=self.path)
+        committer = asyncio.create_task(self._committer())
+        try:
+            async with server:
+                await self._stop.wait()
+        finally:
+            committer.cancel()
+            self.flush()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def run(self) -> None:
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+
+def request(path, payload: dict) -> dict:
+    """Send one request to a running server and return its decoded reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as f:
+            return json.loads(f.readline())
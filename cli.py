@@ -1,5 +1,110 @@
-﻿import argparse, json
-from calc import Calculator, _HISTORY
+﻿import argparse, csv, datetime, json, sys
+from calc import Calculator, JsonlHistory, SqliteHistory, _HISTORY, np
+def read_operands(path):
+    """CSV (A,B の 2 列。見出し行は任意) か .npy (n×2) からオペランド列を読む"""
+    if path.endswith(".npy"):
+        if np is None:
+            raise SystemExit("NumPy is required to read .npy files")
+        data = np.load(path)
+        return data[:, 0], data[:, 1]
+    with open(path, newline="", encoding="utf-8") as f:
+        first = f.readline()
+        header = 0 if _is_number(first.split(",")[0]) else 1
+        if np is not None:
+            f.seek(0)
+            data = np.loadtxt(f, delimiter=",", ndmin=2, skiprows=header)
+            return data[:, 0], data[:, 1]
+        rows = [row for row in csv.reader([first][header:] + f.readlines()) if row]
+    return [float(r[0]) for r in rows], [float(r[1]) for r in rows]
+def read_columns(path):
+    """名前付きの列を読む。CSV は見出し行の名前、.npy (n×k) は先頭から a, b, c, ..."""
+    if path.endswith(".npy"):
+        if np is None:
+            raise SystemExit("NumPy is required to read .npy files")
+        data = np.load(path)
+        return {chr(ord("a") + i): data[:, i] for i in range(data.shape[1])}
+    with open(path, newline="", encoding="utf-8") as f:
+        names = [name.strip() for name in f.readline().split(",")]
+        if np is not None:
+            data = np.loadtxt(f, delimiter=",", ndmin=2)
+            return {name: data[:, i] for i, name in enumerate(names)}
+        rows = [row for row in csv.reader(f) if row]
+    return {name: [float(r[i]) for r in rows] for i, name in enumerate(names)}
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+def write_results(path, results) -> None:
+    """結果列を .npy または 1 行 1 値のテキストとしてまとめて書き出す"""
+    if path and path.endswith(".npy"):
+        if np is None:
+            raise SystemExit("NumPy is required to write .npy files")
+        np.save(path, np.asarray(results))
+        return
+    text = "".join(f"{r!r}\n" for r in _tolist(results))
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+def _tolist(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+def run_batch(c, op, path, out=None) -> None:
+    a, b = read_operands(path)
+    results, valid = c.batch(op, a, b)
+    write_results(out, results)
+    c.save_many((op, x, y, r) for x, y, r, ok in
+                zip(_tolist(a), _tolist(b), _tolist(results), _tolist(valid)) if ok)
+def print_history(records, out=None) -> None:
+    """履歴を JSON 配列として 1 件ずつ書き出す (全件をメモリに載せない)"""
+    out = out or sys.stdout
+    out.write("[")
+    first = True
+    for record in records:
+        out.write("\n  " if first else ",\n  ")
+        out.write(json.dumps(record, ensure_ascii=False))
+        first = False
+    out.write("]\n" if first else "\n]\n")
+def run_expr(c, text, path, out=None) -> None:
+    from calc_expr import compile_expr
+    results, _valid = compile_expr(text).evaluate_columns(read_columns(path), c)
+    write_results(out, results)
+def non_negative_int(text) -> int:
+    """--limit/--offset 用の argparse 型。負の値は islice が受け付けないのでここで弾く"""
+    try:
+        n = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an integer: {text!r}") from None
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater: {n}")
+    return n
+def iso_datetime(text) -> datetime.datetime:
+    """--since 用の argparse 型。履歴の時刻はローカル時刻 (naive) なので、タイムゾーン付きの値はローカル時刻に変換する"""
+    try:
+        ts = datetime.datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO 8601 date/time: {text!r}") from None
+    return ts.astimezone().replace(tzinfo=None) if ts.tzinfo else ts
+def make_calculator(args) -> Calculator:
+    store = SqliteHistory(args.db, dedupe=args.dedupe) if args.db else JsonlHistory()
+    return Calculator(store, cache_size=args.cache_size)
+def run_client(args) -> None:
+    """--connect: 起動済みの --serve サーバに演算や --list を依頼する"""
+    from calc_server import request
+    for op in ("add", "sub", "mul", "div"):
+        if getattr(args, op):
+            a, b = getattr(args, op)
+            reply = request(args.connect, {"op": op, "a": a, "b": b})
+            if "error" in reply:
+                raise SystemExit(reply["error"])
+            print(reply["result"])
+            return
+    if args.list:
+        reply = request(args.connect, {"op": "list", "filter": args.op, "offset": args.offset, "limit": args.limit,
+                                       "since": args.since and args.since.isoformat()})
+        print_history(reply["records"])
 def main() -> None:
     parser = argparse.ArgumentParser(description="Calculator CLI")
     parser.add_argument("--add", nargs=2, type=float, metavar=("A", "B"))
@@ -7,8 +112,40 @@ def main() -> None:
     parser.add_argument("--mul", nargs=2, type=float, metavar=("A", "B"))
     parser.add_argument("--div", nargs=2, type=float, metavar=("A", "B"))
     parser.add_argument("--list", action="store_true", help="print history JSON")
+    parser.add_argument("--batch", metavar="FILE", help="apply --op to every A,B row of a CSV/.npy file")
+    parser.add_argument("--expr", metavar="TEXT",
+                        help="--batch: evaluate an expression such as '(a*b)+c/d' over the named columns")
+    parser.add_argument("--out", metavar="FILE", help="--batch: write results here (.npy or text)")
+    parser.add_argument("--stats", action="store_true", help="print per-operation counts and result aggregates")
+    parser.add_argument("--db", metavar="FILE", help="keep history in this SQLite database instead of history.jsonl")
+    parser.add_argument("--dedupe", action="store_true", help="--db: store repeats of the same operation as one record with a count")
+    parser.add_argument("--op", choices=["add", "sub", "mul", "div", "pow"],
+                        help="--batch: operation to apply; --list/--stats: only this operation")
+    parser.add_argument("--since", type=iso_datetime, metavar="ISODATE",
+                        help="--list/--stats: only records at or after this time")
+    parser.add_argument("--limit", type=non_negative_int, help="--list: print at most N records")
+    parser.add_argument("--offset", type=non_negative_int, default=0, help="--list: skip the first N records")
+    parser.add_argument("--serve", metavar="SOCKET", help="run a calculator server on this Unix socket")
+    parser.add_argument("--interval", type=float, default=0.5, help="--serve: seconds between history writes")
+    parser.add_argument("--cache-size", type=non_negative_int, default=0, metavar="N",
+                        help="--serve: remember the last N distinct results (only useful for a long-running server)")
+    parser.add_argument("--connect", metavar="SOCKET", help="send the operation to a running --serve server")
     args = parser.parse_args()
-    c = Calculator()
+    # history.jsonl は追記専用なので、1 回の実行で 1 件書くだけでは同じ演算をまとめられない
+    if args.dedupe and not args.db:
+        parser.error("--dedupe requires --db")
+    if args.cache_size and not args.serve:
+        parser.error("--cache-size only applies to --serve")
+    if args.serve:
+        from calc_server import CalcServer
+        CalcServer(args.serve, make_calculator(args), interval=args.interval).run()
+        return
+    if args.connect:
+        if not (args.add or args.sub or args.mul or args.div or args.list):
+            parser.error("--connect requires --add/--sub/--mul/--div or --list")
+        run_client(args)
+        return
+    c = make_calculator(args)
     if args.add:
         a, b = args.add; r = c.add(a, b); c.save("add", a, b, r); print(r)
     elif args.sub:
@@ -17,8 +154,16 @@ def main() -> None:
         a, b = args.mul; r = c.mul(a, b); c.save("mul", a, b, r); print(r)
     elif args.div:
         a, b = args.div; r = c.div(a, b); c.save("div", a, b, r); print(r)
+    elif args.batch and args.expr:
+        run_expr(c, args.expr, args.batch, args.out)
+    elif args.batch:
+        if not args.op:
+            parser.error("--batch requires --op or --expr")
+        run_batch(c, args.op, args.batch, args.out)
     elif args.list:
-        print(json.dumps(c.history(), ensure_ascii=False, indent=2))
+        print_history(c.iter_history(op=args.op, since=args.since, offset=args.offset, limit=args.limit))
+    elif args.stats:
+        print(json.dumps(c.stats(op=args.op, since=args.since), ensure_ascii=False, indent=2))
     else:
         parser.print_help()
 if __name__ == "__main__":
@@ -1,95 +1,235 @@
-import json
+"""World Bank indicator data for the dashboard: fetching, caching and the CLI.
+
+``python3 dashboard.py`` opens the Tk window (:mod:`dashboard_gui`);
+``python3 dashboard.py report ...`` renders charts headlessly
+(:mod:`dashboard_report`).  Neither tkinter nor the GUI is imported unless
+``Dashboard`` is used, and pandas and requests are only loaded on first use.
+"""
+import argparse
 import pathlib
-import tkinter as tk
-from tkinter import ttk
-
-try:
-    import pandas as pd
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    pd = None
-
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    plt = None
-    FigureCanvasTkAgg = None
-try:
-    import requests
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    requests = None
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dashboard_cache import FrameCache
+from lazy import lazy_import
+
+pd = lazy_import("pandas")
+requests = lazy_import("requests")
 
 CACHE_DIR = pathlib.Path(__file__).resolve().parent / "cache"
-CACHE_DIR.mkdir(exist_ok=True)
 
 INDICATORS = {
     "GDP": "NY.GDP.MKTP.CD",
     "CO2": "EN.ATM.CO2E.PC",
 }
 
-def get_indicator_data(country, indicator, cache_dir=CACHE_DIR):
-    """Return DataFrame of indicator data for the given country."""
+API_URL = "https://api.worldbank.org/v2"
+PER_PAGE = 1000
+RETRY_STATUS = {429, 500, 502, 503, 504}
+CACHE_TTL = 24 * 3600
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _fetch(url, session=None, retries=0, backoff=0.5, headers=None):
+    """GET ``url`` and return the response, retrying transient failures.
+
+    Connection errors, timeouts and 429/5xx responses are retried up to
+    ``retries`` times with exponential backoff.
+    """
+    http = session if session is not None else requests
+    for attempt in range(retries + 1):
+        try:
+            res = http.get(url, timeout=10, headers=headers)
+            res.raise_for_status()
+            return res
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            status = getattr(e.response, "status_code", None)
+            if attempt == retries or (isinstance(e, requests.HTTPError) and status not in RETRY_STATUS):
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def fetch_series(country, indicator, session=None, base_url=API_URL, retries=0, per_page=None,
+                 page_workers=4, etag=None, last_modified=None):
+    """Download every page of a series and return ``(dates, values, validators)``.
+
+    The first response's metadata gives the page count; the remaining pages
+    are then fetched concurrently (in order) and each page is reduced to the
+    two columns as soon as it is parsed.  ``validators`` holds the first
+    page's ETag/Last-Modified; when ``etag``/``last_modified`` are given the
+    first request is conditional and None is returned on 304 Not Modified.
+    """
+    url = f"{base_url}/country/{country}/indicator/{indicator}?format=json&per_page={per_page or PER_PAGE}"
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    res = _fetch(url, session, retries, headers=headers or None)
+    if res.status_code == 304:
+        return None
+    validators = {"etag": res.headers.get("ETag"), "last_modified": res.headers.get("Last-Modified")}
+    dates, values = [], []
+    meta = _read_page(res.json(), dates, values)
+    pages = int(meta.get("pages") or 1) if isinstance(meta, dict) else 1
+    if pages > 1:
+        urls = [f"{url}&page={n}" for n in range(2, pages + 1)]
+        with ThreadPoolExecutor(max_workers=min(page_workers, len(urls))) as pool:
+            for res in pool.map(lambda u: _fetch(u, session, retries), urls):
+                _read_page(res.json(), dates, values)
+    return dates, values, validators
+
+
+class APIError(ValueError):
+    """The World Bank API answered with an error message instead of data."""
+
+
+def _read_page(payload, dates, values):
+    """Append one page's date/value pairs to the column lists; return its metadata.
+
+    Raises :class:`APIError` for an error payload (e.g. an unknown country
+    or indicator), which the API sends as a one-element list.
+    """
+    meta = payload[0] if payload else None
+    if len(payload) < 2 or (isinstance(meta, dict) and "message" in meta):
+        messages = meta.get("message") if isinstance(meta, dict) else None
+        text = "; ".join(str(m.get("value") or m.get("key") or m) if isinstance(m, dict) else str(m)
+                         for m in messages or ())
+        raise APIError(text or f"unexpected response: {payload!r}")
+    rows = payload[1]
+    for row in rows or ():
+        dates.append(row["date"])
+        values.append(row["value"])
+    return payload[0]
+
+
+def frame_cache(cache_dir=CACHE_DIR):
+    """The shared :class:`FrameCache` stored in ``cache_dir`` (created if needed)."""
+    path = pathlib.Path(cache_dir) / "frames.sqlite"
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None or not path.exists():
+            if cache is not None:
+                cache.close()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            cache = _caches[path] = FrameCache(path, ttl=CACHE_TTL)
+        return cache
+
+
+def close_caches():
+    """Close every cache opened by :func:`frame_cache`."""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.close()
+        _caches.clear()
+
+
+def _clean(df):
+    df = df.dropna().astype({"date": int, "value": float})
+    return df.sort_values("date", ignore_index=True)
+
+
+def get_indicator_data(country, indicator, cache_dir=CACHE_DIR, session=None, base_url=API_URL, retries=0):
+    """Return DataFrame of indicator data for the given country.
+
+    Cleaned frames are kept in :func:`frame_cache`; expired entries are
+    revalidated with a conditional request, and still returned if that
+    request fails (e.g. while offline).  A ``{country}_{indicator}.csv``
+    left by older versions is imported into the cache and removed.
+    """
     if pd is None:
         raise ImportError("pandas is required for get_indicator_data")
     if requests is None:
         raise ImportError("requests is required for get_indicator_data")
-    fname = cache_dir / f"{country}_{indicator}.csv"
-    if fname.exists():
-        df = pd.read_csv(fname)
-    else:
-        url = f"https://api.worldbank.org/v2/country/{country}/indicator/{indicator}?format=json&per_page=1000"
-        res = requests.get(url, timeout=10)
-        res.raise_for_status()
-        data = res.json()[1]
-        df = pd.DataFrame(data)[["date", "value"]]
-        df.to_csv(fname, index=False)
-    df = df.dropna()
-    df["date"] = df["date"].astype(int)
-    return df.sort_values("date")
-
-
-class Dashboard(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("World Bank Dashboard")
-        self.country_var = tk.StringVar(value="JPN")
-        self.indicator_var = tk.StringVar(value="GDP")
-        self.chart_type = tk.StringVar(value="line")
-        self._create_widgets()
-        self._create_plot()
-
-    def _create_widgets(self):
-        frm = ttk.Frame(self)
-        frm.pack(side=tk.TOP, fill=tk.X)
-        ttk.Label(frm, text="Country code").pack(side=tk.LEFT)
-        ttk.Entry(frm, textvariable=self.country_var, width=6).pack(side=tk.LEFT)
-        ttk.Label(frm, text="Indicator").pack(side=tk.LEFT)
-        ttk.Combobox(frm, textvariable=self.indicator_var, values=list(INDICATORS.keys()), width=5).pack(side=tk.LEFT)
-        ttk.Radiobutton(frm, text="Line", variable=self.chart_type, value="line", command=self.update_plot).pack(side=tk.LEFT)
-        ttk.Radiobutton(frm, text="Scatter", variable=self.chart_type, value="scatter", command=self.update_plot).pack(side=tk.LEFT)
-        ttk.Button(frm, text="Plot", command=self.update_plot).pack(side=tk.LEFT)
-
-    def _create_plot(self):
-        self.fig, self.ax = plt.subplots(figsize=(5, 4))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.update_plot()
-
-    def update_plot(self):
-        code = self.country_var.get()
-        ind_key = self.indicator_var.get()
-        indicator = INDICATORS[ind_key]
-        df = get_indicator_data(code, indicator)
-        self.ax.clear()
-        if self.chart_type.get() == "line":
-            self.ax.plot(df["date"], df["value"], marker="o")
-        else:
-            self.ax.scatter(df["date"], df["value"])
-        self.ax.set_title(f"{code} {ind_key}")
-        self.ax.set_xlabel("Year")
-        self.ax.set_ylabel(ind_key)
-        self.fig.tight_layout()
-        self.canvas.draw()
+    cache = frame_cache(cache_dir)
+    key = f"{country}_{indicator}"
+    entry = cache.get(key)
+    if entry is None:
+        legacy = pathlib.Path(cache_dir) / f"{key}.csv"
+        if legacy.exists():
+            df = _clean(pd.read_csv(legacy))
+            cache.put(key, df)
+            legacy.unlink()
+            return df
+    elif entry.fresh:
+        return entry.frame
+    validators = {"etag": entry.etag, "last_modified": entry.last_modified} if entry else {}
+    try:
+        series = fetch_series(country, indicator, session, base_url, retries, **validators)
+    except requests.RequestException:
+        if entry is None:
+            raise
+        return entry.frame  # offline: the expired copy beats no data
+    if series is None:
+        cache.renew(key)
+        return entry.frame
+    dates, values, validators = series
+    df = _clean(pd.DataFrame({"date": dates, "value": values}))
+    cache.put(key, df, **validators)
+    return df
 
-if __name__ == "__main__":
+
+def get_many(countries, indicators, cache_dir=CACHE_DIR, max_workers=8, retries=3, progress=None,
+             base_url=API_URL, raise_errors=True):
+    """Fetch every country x indicator pair concurrently.
+
+    Requests share one pooled ``requests.Session`` and at most
+    ``max_workers`` run at once; transient failures are retried with
+    backoff.  ``progress(done, total, (country, indicator), error)`` is
+    called as each pair finishes.  Returns ``{(country, indicator): DataFrame}``;
+    with ``raise_errors=False`` failed pairs are left out instead of raising.
+    """
+    if requests is None:
+        raise ImportError("requests is required for get_many")
+    keys = [(c, i) for c in countries for i in indicators]
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    results, errors = {}, {}
+    with session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(get_indicator_data, c, i, cache_dir, session, base_url, retries): (c, i)
+            for c, i in keys
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            error = future.exception()
+            if error is None:
+                results[key] = future.result()
+            else:
+                errors[key] = error
+            if progress is not None:
+                progress(len(results) + len(errors), len(keys), key, error)
+    if errors and raise_errors:
+        raise next(iter(errors.values()))
+    return {key: results[key] for key in keys if key in results}
+
+
+def __getattr__(name):
+    if name == "Dashboard":
+        from dashboard_gui import Dashboard
+        return Dashboard
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="World Bank indicator dashboard")
+    commands = parser.add_subparsers(dest="command")
+    import dashboard_report
+    dashboard_report.add_arguments(commands.add_parser("report", help=dashboard_report.__doc__.splitlines()[0]))
+    args = parser.parse_args(argv)
+    if args.command == "report":
+        return dashboard_report.run(args)
+    from dashboard_gui import Dashboard
     Dashboard().mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so the GUI and report share its caches.
+    import dashboard
+    raise SystemExit(dashboard.main())
@@ -0,0 +1,167 @@
+# coding: utf-8
+"""Consolidated on-disk cache of cleaned indicator frames.
+
+Each entry is a date/value DataFrame serialized as Arrow Feather (or NPZ
+when pyarrow is not installed) and stored as a blob in a single SQLite file
+together with its expiry time and the HTTP validators (ETag /
+Last-Modified) needed to revalidate it.  The store is trimmed to
+``max_bytes`` by dropping the least recently used entries.  :class:`MemoryLRU`
+keeps recently used frames in process in front of it.
+"""
+import io
+import pathlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+feather = lazy_import("pyarrow.feather")
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+Entry = namedtuple("Entry", "frame fresh etag last_modified")
+
+
+def _dumps(frame, fmt):
+    buf = io.BytesIO()
+    if fmt == "feather":
+        feather.write_feather(frame.reset_index(drop=True), buf)
+    else:
+        np.savez(buf, date=frame["date"].to_numpy(), value=frame["value"].to_numpy())
+    return buf.getvalue()
+
+
+def _loads(blob, fmt):
+    if fmt == "feather":
+        return feather.read_feather(io.BytesIO(blob))
+    with np.load(io.BytesIO(blob)) as data:
+        return pd.DataFrame({"date": data["date"], "value": data["value"]})
+
+
+class FrameCache:
+    """SQLite-backed store of DataFrames keyed by string.
+
+    ``get`` returns an :class:`Entry` (or None); expired entries are still
+    returned with ``fresh=False`` so the caller can revalidate them and call
+    :meth:`renew` on a 304.  Safe to share between threads.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, fmt=None, clock=time.time):
+        if pd is None:
+            raise ImportError("pandas is required for FrameCache")
+        self.path = pathlib.Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.fmt = fmt or ("feather" if feather is not None else "npz")
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS frames (key TEXT PRIMARY KEY, fmt TEXT, data BLOB, size INTEGER,"
+            " expires REAL, accessed REAL, etag TEXT, last_modified TEXT)"
+        )
+        self._stats = dict(hits=0, stale=0, misses=0, renewed=0, evictions=0, load_seconds=0.0, store_seconds=0.0)
+
+    def get(self, key):
+        start = time.perf_counter()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fmt, data, expires, etag, last_modified FROM frames WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE frames SET accessed = ? WHERE key = ?", (self.clock(), key))
+        fmt, data, expires, etag, last_modified = row
+        entry = Entry(_loads(data, fmt), expires > self.clock(), etag, last_modified)
+        with self._lock:
+            self._stats["hits" if entry.fresh else "stale"] += 1
+            self._stats["load_seconds"] += time.perf_counter() - start
+        return entry
+
+    def put(self, key, frame, etag=None, last_modified=None, ttl=None):
+        start = time.perf_counter()
+        data = _dumps(frame, self.fmt)
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO frames VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, self.fmt, data, len(data), now + (self.ttl if ttl is None else ttl), now, etag, last_modified),
+            )
+            self._evict()
+            self._stats["store_seconds"] += time.perf_counter() - start
+
+    def renew(self, key, ttl=None):
+        """Extend an entry's lifetime after the server confirmed it is unchanged."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE frames SET expires = ? WHERE key = ?", (self.clock() + (self.ttl if ttl is None else ttl), key)
+            )
+            self._stats["renewed"] += 1
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM frames").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM frames ORDER BY accessed").fetchall():
+            self._conn.execute("DELETE FROM frames WHERE key = ?", (key,))
+            self._stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        """Hit/miss counters, bytes stored and mean load/store latency in ms."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"], stats["bytes"] = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM frames"
+            ).fetchone()
+        loads = stats["hits"] + stats["stale"]
+        stats["mean_load_ms"] = 1000 * stats.pop("load_seconds") / loads if loads else 0.0
+        stats["store_ms"] = 1000 * stats.pop("store_seconds")
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MemoryLRU:
+    """Thread-safe in-memory map holding the ``maxsize`` most recently used values."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
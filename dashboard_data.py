@@ -0,0 +1,99 @@
+# coding: utf-8
+"""Aligned multi-country views over World Bank indicators.
+
+:class:`Comparison` loads one indicator for many countries into a wide
+frame (one column per country, one row per year) and derives growth
+rates, rolling means, ratios between indicators and cross-country ranks
+from it with vectorized pandas operations.  Wide frames and query results
+are memoized by query key; treat the returned frames as read-only.
+
+Series are read through a loader with the signature of
+:func:`dashboard.get_many`, passed in by the caller, so this module does
+not import :mod:`dashboard`.
+"""
+from dashboard_cache import MemoryLRU
+
+try:
+    import numpy as np
+    import pandas as pd
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = pd = None
+
+TRANSFORMS = ("level", "growth", "rolling", "rank")
+
+
+class Comparison:
+    """Wide frames and derived queries over series read with ``load``.
+
+    ``load(countries, codes, max_workers=..., raise_errors=False)`` returns
+    ``{(country, code): frame}`` like :func:`dashboard.get_many`; bind its
+    cache directory with :func:`functools.partial`.  ``indicators`` maps
+    names such as ``"GDP"`` to codes.
+    """
+
+    def __init__(self, load, indicators=None, maxsize=128, max_workers=8):
+        if pd is None:
+            raise ImportError("pandas is required for Comparison")
+        self.load = load
+        self.indicators = dict(indicators or {})
+        self.max_workers = max_workers
+        self._wide = MemoryLRU(maxsize)
+        self._queries = MemoryLRU(maxsize)
+
+    def wide(self, countries, indicator):
+        """``indicator`` for ``countries`` on a shared, gap-free year index.
+
+        ``indicator`` is a key of ``indicators`` or a raw code.
+        Countries that fail to load are kept as all-NaN columns.
+        """
+        key = (tuple(countries), self._code(indicator))
+        frame = self._wide.get(key)
+        if frame is None:
+            frame = self._build(*key)
+            self._wide.put(key, frame)
+        return frame
+
+    def _code(self, indicator):
+        return self.indicators.get(indicator, indicator)
+
+    def _build(self, countries, code):
+        loaded = self.load(countries, [code], max_workers=self.max_workers, raise_errors=False)
+        columns = {country: j for j, country in enumerate(dict.fromkeys(countries))}
+        series = [(columns[country], df["date"].to_numpy(), df["value"].to_numpy())
+                  for (country, _), df in loaded.items() if len(df)]
+        first = min((dates.min() for _, dates, _ in series), default=0)
+        last = max((dates.max() for _, dates, _ in series), default=-1)
+        values = np.full((last - first + 1, len(columns)), np.nan)
+        for j, dates, column in series:
+            values[dates - first, j] = column
+        return pd.DataFrame(values, index=pd.RangeIndex(first, last + 1, name="year"), columns=list(columns))
+
+    def query(self, countries, indicator, transform="level", per=None, window=5):
+        """A derived wide frame.
+
+        ``per`` divides by another indicator first (e.g. a per-capita ratio);
+        ``transform`` is one of :data:`TRANSFORMS`: the level itself,
+        year-on-year growth in percent, a ``window``-year rolling mean, or
+        the rank across countries in each year (1 = largest).
+        """
+        if transform not in TRANSFORMS:
+            raise ValueError(f"unknown transform {transform!r}; expected one of {TRANSFORMS}")
+        key = (tuple(countries), self._code(indicator), transform, per and self._code(per), window)
+        frame = self._queries.get(key)
+        if frame is not None:
+            return frame
+        frame = self.wide(countries, indicator)
+        if per is not None:
+            frame = frame.div(self.wide(countries, per)).reindex(index=frame.index, columns=frame.columns)
+        if transform == "growth":
+            frame = frame.pct_change(fill_method=None) * 100
+        elif transform == "rolling":
+            frame = frame.rolling(window, min_periods=1).mean()
+        elif transform == "rank":
+            frame = frame.rank(axis=1, ascending=False)
+        self._queries.put(key, frame)
+        return frame
+
+    def clear(self):
+        self._wide.clear()
+        self._queries.clear()
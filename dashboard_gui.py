@@ -0,0 +1,135 @@
+"""Tk front end for the World Bank dashboard.
+
+Run with ``python3 dashboard.py``; the data functions live in :mod:`dashboard`.
+"""
+import functools
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+
+try:
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    plt = None
+    FigureCanvasTkAgg = None
+
+import dashboard_data
+from dashboard import CACHE_DIR, INDICATORS, get_indicator_data, get_many
+from dashboard_cache import MemoryLRU
+from dashboard_plot import SeriesRenderer
+
+
+class Dashboard(tk.Tk):
+    """Plot one indicator for one or more (comma-separated) countries.
+
+    Several countries are loaded as one aligned frame through
+    :class:`dashboard_data.Comparison`.  Series are loaded on a worker pool
+    and kept in a :class:`MemoryLRU`, so switching chart type or revisiting
+    a selection redraws immediately.  Finished loads are handed back to the
+    Tk thread through a queue polled with ``after()``; the other indicators
+    of the shown country are prefetched in the background.
+    """
+
+    poll_ms = 50
+
+    def __init__(self, cache_dir=CACHE_DIR, workers=2):
+        super().__init__()
+        self.title("World Bank Dashboard")
+        self.cache_dir = cache_dir
+        self.country_var = tk.StringVar(value="JPN")
+        self.indicator_var = tk.StringVar(value="GDP")
+        self.chart_type = tk.StringVar(value="line")
+        self.status_var = tk.StringVar(value="")
+        self.frames = MemoryLRU(maxsize=64)
+        self.comparison = dashboard_data.Comparison(functools.partial(get_many, cache_dir=cache_dir), INDICATORS)
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._loaded = queue.Queue()
+        self._pending = set()
+        self._wanted = None
+        self._polling = False
+        self._create_widgets()
+        self._create_plot()
+
+    def _create_widgets(self):
+        frm = ttk.Frame(self)
+        frm.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(frm, text="Country code").pack(side=tk.LEFT)
+        ttk.Entry(frm, textvariable=self.country_var, width=16).pack(side=tk.LEFT)
+        ttk.Label(frm, text="Indicator").pack(side=tk.LEFT)
+        ttk.Combobox(frm, textvariable=self.indicator_var, values=list(INDICATORS.keys()), width=5).pack(side=tk.LEFT)
+        ttk.Radiobutton(frm, text="Line", variable=self.chart_type, value="line", command=self.update_plot).pack(side=tk.LEFT)
+        ttk.Radiobutton(frm, text="Scatter", variable=self.chart_type, value="scatter", command=self.update_plot).pack(side=tk.LEFT)
+        ttk.Button(frm, text="Plot", command=self.update_plot).pack(side=tk.LEFT)
+        ttk.Label(frm, textvariable=self.status_var).pack(side=tk.LEFT)
+
+    def _create_plot(self):
+        self.fig, self.ax = plt.subplots(figsize=(5, 4))
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.renderer = SeriesRenderer(self.fig, self.ax, self.canvas)
+        self.update_plot()
+
+    def update_plot(self):
+        countries = tuple(c.strip() for c in self.country_var.get().split(",") if c.strip())
+        ind_key = self.indicator_var.get()
+        self._wanted = (countries, INDICATORS[ind_key])
+        df = self.frames.get(self._wanted)
+        if df is not None:
+            self.status_var.set("")
+            self._draw(df, countries, ind_key)
+        else:
+            self.status_var.set("Loading...")
+            self._load(countries, INDICATORS[ind_key])
+        for other in INDICATORS.values():
+            if (countries, other) not in self.frames:
+                self._load(countries, other)
+
+    def _load(self, countries, indicator):
+        key = (countries, indicator)
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        if len(countries) == 1:
+            future = self._pool.submit(get_indicator_data, countries[0], indicator, self.cache_dir)
+        else:
+            future = self._pool.submit(self.comparison.wide, countries, indicator)
+        future.add_done_callback(lambda f: self._loaded.put((key, f)))
+        if not self._polling:
+            self._polling = True
+            self.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                key, future = self._loaded.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(key)
+            error = future.exception()
+            if error is None:
+                self.frames.put(key, future.result())
+            if key == self._wanted:
+                if error is None:
+                    self.update_plot()
+                else:
+                    self.status_var.set(f"Error: {error}")
+        self._polling = bool(self._pending)
+        if self._polling:
+            self.after(self.poll_ms, self._poll)
+
+    def destroy(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
+    def _draw(self, df, countries, ind_key):
+        if len(countries) == 1:
+            series = {countries[0]: (df["date"], df["value"])}
+        else:
+            series = {c: (df.index, df[c]) for c in df.columns}
+        self.renderer.render(series, self.chart_type.get(), f"{', '.join(countries)} {ind_key}", "Year", ind_key)
+
+
+if __name__ == "__main__":
+    Dashboard().mainloop()
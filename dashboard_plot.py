@@ -0,0 +1,141 @@
+# coding: utf-8
+"""Incremental matplotlib rendering for the dashboard.
+
+:class:`SeriesRenderer` keeps one artist per series and updates it in place
+instead of clearing and replotting the axes.  When only the data changed
+and it still fits the current view (filling at least ``min_fill`` of it),
+the axes background is restored and just the series are redrawn and
+blitted; ``tight_layout`` runs only when a title, axis label or legend
+entry changed.  Series longer than about twice the axes' pixel width are
+reduced to per-pixel min/max pairs first.
+"""
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def decimate(x, y, width):
+    """Reduce ``(x, y)`` to the min and max point of each of ``width`` buckets.
+
+    ``x`` must be sorted.  The visual envelope of the line is preserved; NaN
+    gaps are kept where a whole bucket is missing.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    n = len(y)
+    if width < 1 or n <= 2 * width:
+        return x, y
+    chunk = -(-n // width)
+    padded = np.full(chunk * -(-n // chunk), np.nan)
+    padded[:n] = y
+    rows = padded.reshape(-1, chunk)
+    missing = np.isnan(rows)
+    lo = np.where(missing, np.inf, rows).argmin(axis=1)
+    hi = np.where(missing, -np.inf, rows).argmax(axis=1)
+    base = np.arange(len(rows)) * chunk
+    idx = np.sort(np.stack([base + lo, base + hi], axis=1), axis=1).ravel()
+    idx = idx[idx < n]
+    return x[idx], y[idx]
+
+
+class SeriesRenderer:
+    margin = 0.05
+    min_fill = 0.5
+
+    def __init__(self, fig, ax, canvas=None):
+        if np is None:
+            raise ImportError("numpy is required for SeriesRenderer")
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas if canvas is not None else fig.canvas
+        self.artists = {}
+        self.kind = None
+        self.labels = None
+        self.full_draws = 0
+        self.blits = 0
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def render(self, series, kind="line", title="", xlabel="", ylabel=""):
+        """Show ``series`` (``{label: (x, y)}``) as lines or scatter points."""
+        width = int(self.ax.bbox.width)
+        data = {label: decimate(x, y, width) for label, (x, y) in series.items()}
+        labels = (title, xlabel, ylabel, tuple(data))
+        structural = kind != self.kind or tuple(data) != tuple(self.artists)
+        if structural:
+            for artist in self.artists.values():
+                artist.remove()
+            self.artists = {label: self._create(kind, label) for label in data}
+            self.kind = kind
+        for label, (x, y) in data.items():
+            self._update(self.artists[label], x, y)
+        limits = self._limits(data.values())
+        if structural or labels != self.labels or not self._fits(limits):
+            self._full_draw(limits, labels)
+        else:
+            self._blit()
+
+    def _create(self, kind, label):
+        if kind == "line":
+            (artist,) = self.ax.plot([], [], marker="o", label=label, animated=True)
+        else:
+            artist = self.ax.scatter([], [], label=label, animated=True)
+        return artist
+
+    def _update(self, artist, x, y):
+        if self.kind == "line":
+            artist.set_data(x, y)
+        else:
+            artist.set_offsets(np.column_stack([x, y]))
+
+    def _limits(self, data):
+        bounds = [(np.nanmin(x), np.nanmax(x), np.nanmin(y), np.nanmax(y))
+                  for x, y in data if len(x) and not np.isnan(y).all()]
+        if not bounds:
+            return self.ax.get_xlim(), self.ax.get_ylim()
+        x0, x1, y0, y1 = (f(col) for f, col in zip((min, max, min, max), zip(*bounds)))
+        return self._pad(x0, x1), self._pad(y0, y1)
+
+    def _fits(self, limits):
+        for (lo, hi), (view_lo, view_hi) in zip(limits, (self.ax.get_xlim(), self.ax.get_ylim())):
+            if lo < view_lo or hi > view_hi or hi - lo < self.min_fill * (view_hi - view_lo):
+                return False
+        return True
+
+    def _pad(self, lo, hi):
+        pad = (hi - lo) * self.margin or abs(lo) * self.margin or 1.0
+        return float(lo - pad), float(hi + pad)
+
+    def _full_draw(self, limits, labels):
+        self.ax.set_xlim(limits[0])
+        self.ax.set_ylim(limits[1])
+        if labels != self.labels:
+            title, xlabel, ylabel, names = labels
+            self.ax.set_title(title)
+            self.ax.set_xlabel(xlabel)
+            self.ax.set_ylabel(ylabel)
+            legend = self.ax.get_legend()
+            if legend is not None:
+                legend.remove()
+            if len(names) > 1:
+                self.ax.legend(fontsize="small")
+            self.fig.tight_layout()
+            self.labels = labels
+        self.canvas.draw()
+        self.full_draws += 1
+
+    def _on_draw(self, event):
+        # Every full draw (including resizes) renders the axes without the
+        # animated series; keep that as the blit background, then add them.
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox) if self.canvas.supports_blit else None
+        for artist in self.artists.values():
+            self.ax.draw_artist(artist)
+
+    def _blit(self):
+        if self._background is None:
+            return self._full_draw((self.ax.get_xlim(), self.ax.get_ylim()), self.labels)
+        self.canvas.restore_region(self._background)
+        for artist in self.artists.values():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+        self.blits += 1
@@ -0,0 +1,118 @@
+# coding: utf-8
+"""Render indicator charts and a summary CSV without a display.
+
+Series are fetched concurrently through :func:`dashboard.get_many` (and its
+on-disk cache); charts are drawn with matplotlib's Agg canvas in a process
+pool, one PNG or SVG per country and indicator::
+
+    python3 dashboard.py report JPN USA DEU --indicators GDP CO2 -o reports --format svg
+
+tkinter is never imported.
+"""
+import csv
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+
+import dashboard
+from lazy import lazy_import
+
+mpl_figure = lazy_import("matplotlib.figure")
+
+SUMMARY_FIELDS = ["country", "indicator", "code", "first_year", "last_year", "points", "last_value",
+                  "min", "max", "mean", "cagr_pct", "chart", "error"]
+
+
+def summarize(df):
+    """Range, extremes and compound annual growth of a cleaned series."""
+    if not len(df):
+        return {"points": 0}
+    dates, values = df["date"].to_numpy(), df["value"].to_numpy()
+    years = int(dates[-1] - dates[0])
+    cagr = None
+    if years > 0 and values[0] > 0 and values[-1] > 0:
+        cagr = 100 * ((values[-1] / values[0]) ** (1 / years) - 1)
+    return {"first_year": int(dates[0]), "last_year": int(dates[-1]), "points": len(dates),
+            "last_value": values[-1], "min": values.min(), "max": values.max(), "mean": values.mean(),
+            "cagr_pct": cagr}
+
+
+def render_chart(job):
+    """Draw one series to ``path``; runs in a worker process."""
+    path, title, ylabel, dates, values = job
+    fig = mpl_figure.Figure(figsize=(6, 4))
+    ax = fig.subplots()
+    ax.plot(dates, values, marker="o", markersize=3)
+    ax.set_title(title)
+    ax.set_xlabel("Year")
+    ax.set_ylabel(ylabel)
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+
+def report(countries, indicators, out_dir, fmt="png", workers=None, cache_dir=None, progress=None):
+    """Write one chart per available series and ``summary.csv`` to ``out_dir``.
+
+    ``indicators`` are :data:`dashboard.INDICATORS` keys or raw codes.
+    Series that fail to download are listed in the summary with their
+    error.  Returns the summary rows.
+    """
+    if mpl_figure is None:
+        raise ImportError("matplotlib is required for report")
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    names = {dashboard.INDICATORS.get(name, name): name for name in indicators}
+    errors = {}
+
+    def track(done, total, key, error):
+        if error is not None:
+            errors[key] = error
+        if progress is not None:
+            progress(done, total, key, error)
+
+    frames = dashboard.get_many(countries, list(names), dashboard.CACHE_DIR if cache_dir is None else cache_dir,
+                                progress=track, raise_errors=False)
+    rows, jobs = [], []
+    for country in countries:
+        for code, name in names.items():
+            row = {"country": country, "indicator": name, "code": code}
+            df = frames.get((country, code))
+            if df is None:
+                row["error"] = str(errors.get((country, code), "no data"))
+            else:
+                row.update(summarize(df))
+                if len(df):
+                    path = out_dir / f"{country}_{name}.{fmt}"
+                    row["chart"] = path.name
+                    jobs.append((path, f"{country} {name}", name, df["date"].to_numpy(), df["value"].to_numpy()))
+            rows.append(row)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            render_chart(job)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            for _ in pool.map(render_chart, jobs, chunksize=max(1, len(jobs) // (4 * workers))):
+                pass
+    with open(out_dir / "summary.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def add_arguments(parser):
+    parser.add_argument("countries", nargs="+", help="country codes, e.g. JPN USA")
+    parser.add_argument("--indicators", nargs="+", default=list(dashboard.INDICATORS),
+                        help="indicator names or World Bank codes (default: all known)")
+    parser.add_argument("-o", "--out", default="report", help="output directory")
+    parser.add_argument("--format", choices=("png", "svg"), default="png")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+
+
+def run(args):
+    rows = report(args.countries, args.indicators, args.out, args.format, args.workers)
+    failed = sum(1 for row in rows if row.get("error"))
+    print(f"{len(rows) - failed} series rendered to {args.out}, {failed} failed")
+    return 1 if failed else 0
@@ -0,0 +1,41 @@
+# coding: utf-8
+"""Durable writes for the append-only JSON Lines logs.
+
+:func:`append_lines` adds records at the end of a log and never continues
+a line left half-written by an interrupted writer; :func:`rewrite_lines`
+replaces a log atomically (temporary file + fsync + ``os.replace``), so a
+reader sees either the old or the new contents.  Used by
+:class:`calc.JsonlHistory` and :class:`todo_app.TaskRepository`; callers
+that share a file between processes hold their own lock around these.
+"""
+import os
+import tempfile
+
+
+def append_lines(path, data):
+    """Append the encoded lines ``data`` to ``path`` with one write and fsync."""
+    with open(path, "ab+") as f:
+        # Start on a fresh line if the last write was torn
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def rewrite_lines(path, lines):
+    """Replace ``path`` with the text ``lines`` (each ending in a newline)."""
+    path = os.fspath(path)
+    directory, name = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory or ".")
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
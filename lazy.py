@@ -0,0 +1,47 @@
+# coding: utf-8
+"""Deferred imports for heavy optional dependencies.
+
+``pd = lazy_import("pandas")`` binds a placeholder that imports pandas on
+first attribute access, or None when pandas is not installed, so the usual
+``if pd is None`` checks keep working without paying the import up front.
+"""
+import importlib
+import importlib.util
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported the first time it is used.
+
+    Attribute reads, writes and deletes go to the real module, so
+    ``unittest.mock.patch("pkg.requests.get")`` patches ``requests.get``.
+    """
+
+    def _load(self):
+        module = self.__dict__.get("_module")
+        if module is None:
+            module = self.__dict__["_module"] = importlib.import_module(self.__name__)
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if "_module" in self.__dict__ else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name):
+    """A :class:`LazyModule` for ``name``, or None if it is not installed."""
+    if importlib.util.find_spec(name.partition(".")[0]) is None:
+        return None
+    return LazyModule(name)
@@ -0,0 +1,133 @@
+import types
+import unittest
+from unittest.mock import patch
+
+import black_scholes_gui
+from black_scholes_gui import BlackScholesApp
+
+
+class StubWidget:
+    """Enough of a Tk widget for BlackScholesApp, without a display."""
+
+    def __init__(self, *args, **kw):
+        self.options = kw
+        self.items = {}
+
+    def pack(self, *args, **kw):
+        pass
+
+    pack_forget = pack
+
+    def configure(self, **kw):
+        self.options.update(kw)
+
+    def __getitem__(self, key):
+        return self.options[key]
+
+    def _create(self, *coords, **kw):
+        self.items[len(self.items) + 1] = coords
+        return len(self.items)
+
+    create_line = create_rectangle = create_oval = _create
+
+    def coords(self, item, *coords):
+        self.items[item] = coords
+
+    def itemconfigure(self, item, **kw):
+        pass
+
+
+class StubVar:
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class StubRoot(StubWidget):
+    def __init__(self):
+        super().__init__()
+        self.queue = []
+
+    def title(self, text):
+        pass
+
+    def after(self, ms, callback):
+        self.queue.append(callback)
+        return len(self.queue)
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def run(self):
+        queue, self.queue = self.queue, []
+        for callback in queue:
+            callback()
+
+
+stub_tk = types.SimpleNamespace(Canvas=StubWidget, DoubleVar=StubVar, StringVar=StubVar, BooleanVar=StubVar,
+                                LEFT="left", RIGHT="right", BOTTOM="bottom", X="x", Y="y")
+stub_ttk = types.SimpleNamespace(**{name: StubWidget for name in
+                                    ("Frame", "Label", "Scale", "Entry", "OptionMenu", "Checkbutton")})
+
+
+class StubAppTestCase(unittest.TestCase):
+    def setUp(self):
+        for name, stub in (("tk", stub_tk), ("ttk", stub_ttk)):
+            patcher = patch.object(black_scholes_gui, name, stub)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.root = StubRoot()
+        self.app = BlackScholesApp(self.root)
+        if self.app.surfaces is not None:
+            self.addCleanup(self.app.surfaces.close)
+        self.frames = []
+        self.app.on_frame = self.frames.append
+
+
+class TestRedrawCoalescing(StubAppTestCase):
+    def test_many_changes_render_once(self):
+        for n in range(25):
+            self.app.vars["S"].set(80.0 + n)
+            self.app.schedule_update()
+        self.assertEqual(len(self.root.queue), 1)
+        self.assertEqual(self.frames, [])
+        self.root.run()
+        self.assertEqual(len(self.frames), 1)
+        self.assertEqual(len(self.app.frame_times), 2)
+        self.assertEqual(self.app.frame_times[-1], self.frames[0])
+        self.assertIn("Price:", self.app.price_lbl["text"])
+
+    def test_next_change_schedules_again(self):
+        self.app.schedule_update()
+        self.root.run()
+        self.app.schedule_update()
+        self.app.schedule_update()
+        self.assertEqual(len(self.root.queue), 1)
+        self.root.run()
+        self.assertEqual(len(self.frames), 2)
+
+
+@unittest.skipIf(black_scholes_gui.np is None, "numpy not installed")
+class TestHeatmapFailure(StubAppTestCase):
+    def test_failed_build_stops_polling(self):
+        def broken(*args, **kw):
+            raise MemoryError("grid too large")
+        with patch("bs_surface.PriceSurface", broken):
+            self.app.show_heatmap.set(True)
+            for _ in range(200):
+                self.app.update()
+                if "failed" in self.app.greeks_lbl["text"]:
+                    break
+                self.root.queue.clear()
+                self.app.surfaces._future.exception(timeout=5)
+        self.assertIn("surface failed: grid too large", self.app.greeks_lbl["text"])
+        self.assertEqual(self.root.queue, [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
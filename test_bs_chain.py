@@ -0,0 +1,72 @@
+import csv
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+import bs_chain
+from bs_model import bs_price, np
+
+ROWS = [
+    ("100", "100", "1", "0.05", "0.2", "Call"),
+    ("100", "110", "0.5", "0.01", "0.3", "Put"),
+    ("80", "100", "2", "0.03", "0.25", "Call"),
+]
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestChainPricer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.chain = self.dir / "chain.csv"
+        with open(self.chain, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["type", "S", "K", "T", "r", "sigma"])
+            w.writerows([row[-1:] + row[:-1] for row in ROWS * 5])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *args):
+        with redirect_stderr(io.StringIO()) as err:
+            bs_chain.main([str(a) for a in args])
+        self.assertIn("options/s", err.getvalue())
+
+    def read(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def test_csv_chunks_and_workers(self):
+        self.run_cli(self.chain, "-o", self.dir / "one.csv", "--workers", 1, "--chunk-size", 4)
+        self.run_cli(self.chain, "-o", self.dir / "two.csv", "--workers", 2, "--chunk-size", 4)
+        one, two = self.read(self.dir / "one.csv"), self.read(self.dir / "two.csv")
+        self.assertEqual(one, two)
+        self.assertEqual(len(one), 15)
+        for row, src in zip(one, ROWS * 5):
+            S, K, T, r, sigma = map(float, src[:5])
+            self.assertAlmostEqual(float(row["price"]), bs_price(S, K, T, r, sigma, src[5]), places=4)
+            self.assertEqual(row["type"], src[5])
+
+    def test_bounded_read_ahead(self):
+        pulled = []
+
+        def chunks():
+            for i in range(20):
+                pulled.append(i)
+                yield {"S": [100.0], "K": [100.0], "T": [1.0], "r": [0.0], "sigma": [0.2], "type": ["Call"]}
+
+        results = bs_chain.price_chunks(chunks(), workers=2)
+        next(results)
+        self.assertLessEqual(len(pulled), 4)
+        self.assertEqual(len(list(results)), 19)
+
+    @unittest.skipIf(bs_chain.pq is None, "pyarrow not installed")
+    def test_parquet_round_trip(self):
+        self.run_cli(self.chain, "-o", self.dir / "out.parquet", "--workers", 1, "--chunk-size", 7)
+        self.run_cli(self.dir / "out.parquet", "-o", self.dir / "back.csv", "--workers", 1)
+        self.run_cli(self.chain, "-o", self.dir / "direct.csv", "--workers", 1)
+        self.assertEqual(self.read(self.dir / "back.csv"), self.read(self.dir / "direct.csv"))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
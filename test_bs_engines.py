@@ -0,0 +1,37 @@
+import unittest
+from bs_engines import binomial_price, mc_price
+from bs_model import bs_price, np
+
+ARGS = (100.0, 105.0, 0.75, 0.04, 0.25)
+
+class TestBinomial(unittest.TestCase):
+    def test_converges_to_black_scholes(self):
+        for option in ("Call", "Put"):
+            exact = bs_price(*ARGS, option)
+            self.assertAlmostEqual(binomial_price(*ARGS, option, steps=2000), exact, places=2)
+            coarse = abs(binomial_price(*ARGS, option, steps=50) - exact)
+            fine = abs(binomial_price(*ARGS, option, steps=800) - exact)
+            self.assertLess(fine, coarse)
+
+    def test_american_exercise(self):
+        self.assertGreater(binomial_price(*ARGS, "Put", american=True), binomial_price(*ARGS, "Put"))
+        # without dividends early exercise of a call is never optimal
+        self.assertAlmostEqual(binomial_price(*ARGS, "Call", american=True), binomial_price(*ARGS, "Call"))
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestMonteCarlo(unittest.TestCase):
+    def test_within_standard_errors(self):
+        for option in ("Call", "Put"):
+            price, err = mc_price(*ARGS, option, paths=400_000, chunk_size=50_000, seed=1)
+            self.assertLess(abs(price - bs_price(*ARGS, option)), 4 * err)
+
+    def test_variance_reduction(self):
+        _, plain = mc_price(*ARGS, "Call", paths=200_000, antithetic=False, control=False, seed=2)
+        _, reduced = mc_price(*ARGS, "Call", paths=200_000, seed=2)
+        self.assertLess(reduced, plain / 2)
+
+    def test_seeded(self):
+        self.assertEqual(mc_price(*ARGS, "Put", paths=10_000, seed=7), mc_price(*ARGS, "Put", paths=10_000, seed=7))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,48 @@
+import unittest
+from bs_greeks import GREEKS, greeks, greeks_vec, implied_vol
+from bs_model import bs_price, bs_price_vec, np
+
+class TestGreeks(unittest.TestCase):
+    def test_finite_differences(self):
+        S, K, T, r, sigma, h = 100.0, 110.0, 0.75, 0.04, 0.3, 1e-4
+        for option in ("Call", "Put"):
+            g = greeks(S, K, T, r, sigma, option)
+            p = lambda **kw: bs_price(kw.get("S", S), K, kw.get("T", T), kw.get("r", r), kw.get("sigma", sigma), option)
+            self.assertAlmostEqual(g["price"], p())
+            self.assertAlmostEqual(g["delta"], (p(S=S + h) - p(S=S - h)) / (2 * h), places=5)
+            self.assertAlmostEqual(g["gamma"], (p(S=S + 1e-2) - 2 * p() + p(S=S - 1e-2)) / 1e-4, places=4)
+            self.assertAlmostEqual(g["vega"], (p(sigma=sigma + h) - p(sigma=sigma - h)) / (2 * h), places=4)
+            self.assertAlmostEqual(g["rho"], (p(r=r + h) - p(r=r - h)) / (2 * h), places=4)
+            self.assertAlmostEqual(g["theta"], -(p(T=T + h) - p(T=T - h)) / (2 * h), places=4)
+
+    def test_invalid_inputs(self):
+        self.assertEqual(greeks(100, 100, 0, 0.05, 0.2, "Call"), dict.fromkeys(GREEKS, 0.0))
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestGreeksVec(unittest.TestCase):
+    def test_matches_scalar(self):
+        S = np.array([80.0, 100.0, 120.0])
+        vec = greeks_vec(S, 100.0, 1.0, 0.05, 0.2, [True, False, True])
+        for i, option in enumerate(("Call", "Put", "Call")):
+            scalar = greeks(S[i], 100.0, 1.0, 0.05, 0.2, option)
+            for name in GREEKS:
+                self.assertAlmostEqual(vec[name][i], scalar[name], places=4)
+
+    def test_implied_vol_round_trip(self):
+        rng = np.random.default_rng(0)
+        n = 20000
+        S, K = rng.uniform(90, 110, n), rng.uniform(90, 110, n)
+        T, r = rng.uniform(0.25, 2, n), rng.uniform(0, 0.08, n)
+        sigma, call = rng.uniform(0.1, 0.8, n), rng.random(n) < 0.5
+        iv, converged = implied_vol(bs_price_vec(S, K, T, r, sigma, call), S, K, T, r, call)
+        self.assertTrue(converged.all())
+        self.assertLess(np.max(np.abs(iv - sigma)), 1e-6)
+
+    def test_implied_vol_arbitrage_bounds(self):
+        iv, converged = implied_vol([0.0, 150.0, 10.45], 100.0, 100.0, 1.0, 0.05)
+        self.assertEqual(list(converged), [False, False, True])
+        self.assertTrue(np.isnan(iv[:2]).all())
+        self.assertAlmostEqual(iv[2], 0.2, places=3)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
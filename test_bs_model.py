@@ -0,0 +1,62 @@
+import unittest
+import bs_model
+from bs_model import CDF_BACKENDS, bs_price, bs_price_vec, cnd, cnd_vec, np
+
+class TestBsPrice(unittest.TestCase):
+    def test_put_call_parity(self):
+        import math
+        S, K, T, r, sigma = 100.0, 95.0, 0.5, 0.03, 0.25
+        call = bs_price(S, K, T, r, sigma, "Call")
+        put = bs_price(S, K, T, r, sigma, "Put")
+        self.assertAlmostEqual(call - put, S - K * math.exp(-r * T))
+
+    def test_invalid_inputs(self):
+        self.assertEqual(bs_price(100, 100, 0, 0.05, 0.2, "Call"), 0.0)
+        self.assertEqual(bs_price(100, 100, 1, 0.05, 0, "Put"), 0.0)
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestBsPriceVec(unittest.TestCase):
+    def test_cnd_vec(self):
+        xs = np.linspace(-8, 8, 321)
+        expected = np.array([cnd(x) for x in xs])
+        self.assertLess(np.max(np.abs(cnd_vec(xs) - expected)), 1e-7)
+
+    def test_backends_error_bound(self):
+        xs = np.linspace(-8, 8, 1601)
+        expected = np.array([cnd(x) for x in xs])
+        for name in CDF_BACKENDS:
+            with self.subTest(backend=name):
+                self.assertLess(np.max(np.abs(cnd_vec(xs, name) - expected)), 6e-8)
+
+    def test_set_backend(self):
+        previous = bs_model.cdf_backend()
+        self.addCleanup(bs_model.set_cdf_backend, previous)
+        bs_model.set_cdf_backend("erf")
+        self.assertEqual(bs_price_vec(100, 95, 1, 0.05, 0.2, True), bs_price(100, 95, 1, 0.05, 0.2, "Call"))
+        with self.assertRaises(ValueError):
+            bs_model.set_cdf_backend("nope")
+        with self.assertRaises(ValueError):
+            cnd_vec([0.0], "nope")
+
+    def test_matches_scalar(self):
+        rng = np.random.default_rng(0)
+        n = 500
+        S = rng.uniform(50, 150, n)
+        K = rng.uniform(50, 150, n)
+        T = rng.uniform(0.05, 2, n)
+        r = rng.uniform(0, 0.1, n)
+        sigma = rng.uniform(0.05, 0.6, n)
+        is_call = rng.random(n) < 0.5
+        vec = bs_price_vec(S, K, T, r, sigma, is_call)
+        scalar = [bs_price(S[i], K[i], T[i], r[i], sigma[i], "Call" if is_call[i] else "Put") for i in range(n)]
+        np.testing.assert_allclose(vec, scalar, rtol=1e-6, atol=1e-4)
+
+    def test_broadcast_and_invalid(self):
+        prices = bs_price_vec([0.0, 100.0, 120.0], 100.0, 1.0, 0.05, 0.2, True)
+        self.assertEqual(prices.shape, (3,))
+        self.assertEqual(prices[0], 0.0)
+        self.assertAlmostEqual(prices[1], bs_price(100, 100, 1, 0.05, 0.2, "Call"), places=6)
+        self.assertEqual(bs_price_vec(100, 100, 0.0, 0.05, 0.2, False), 0.0)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
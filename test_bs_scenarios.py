@@ -0,0 +1,53 @@
+import unittest
+from bs_model import bs_price, np
+
+try:
+    import pandas as pd
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    pd = None
+
+if np is not None:
+    from bs_scenarios import scenario_pnl
+
+BOOK = {
+    "S": [100.0, 95.0, 120.0, 80.0],
+    "K": [100.0, 100.0, 110.0, 90.0],
+    "T": [1.0, 0.5, 0.25, 2.0],
+    "r": [0.03, 0.03, 0.02, 0.04],
+    "sigma": [0.2, 0.3, 0.25, 0.4],
+    "type": ["Call", "Put", "Call", "Put"],
+    "quantity": [10, -5, 3, 7],
+}
+SPOT, VOL, RATE = [-0.1, 0.0, 0.15], [-0.05, 0.0, 0.1], [0.0, 0.01]
+
+def reference(i, j, k):
+    total = 0.0
+    for S, K, T, r, sigma, option, q in zip(*BOOK.values()):
+        base = bs_price(S, K, T, r, sigma, option)
+        total += q * (bs_price(S * (1 + SPOT[i]), K, T, r + RATE[k], sigma + VOL[j], option) - base)
+    return total
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestScenarioPnl(unittest.TestCase):
+    def test_matches_scalar_revaluation(self):
+        pnl = scenario_pnl(BOOK, SPOT, VOL, RATE)
+        self.assertEqual(pnl.shape, (3, 3, 2))
+        for i in range(3):
+            for j in range(3):
+                for k in range(2):
+                    self.assertAlmostEqual(pnl[i, j, k], reference(i, j, k), places=4)
+        self.assertAlmostEqual(pnl[1, 1, 0], 0.0)
+
+    def test_chunks_and_workers(self):
+        full = scenario_pnl(BOOK, SPOT, VOL, RATE)
+        np.testing.assert_allclose(scenario_pnl(BOOK, SPOT, VOL, RATE, max_cells=18), full)
+        np.testing.assert_allclose(scenario_pnl(BOOK, SPOT, VOL, RATE, max_cells=18, workers=2), full)
+
+    @unittest.skipIf(pd is None, "pandas not installed")
+    def test_dataframe_without_quantity(self):
+        df = pd.DataFrame(BOOK).drop(columns="quantity")
+        ones = dict(BOOK, quantity=[1] * 4)
+        np.testing.assert_allclose(scenario_pnl(df, SPOT), scenario_pnl(ones, SPOT))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,60 @@
+import time
+import unittest
+from bs_greeks import greeks
+from bs_model import bs_price, np
+
+if np is not None:
+    from bs_surface import PriceSurface, SurfaceCache
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestPriceSurface(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.surface = PriceSurface(100.0, 0.05, "Put")
+
+    def test_interpolation_accuracy(self):
+        for S, sigma, T in ((83.3, 0.17, 0.42), (104.9, 0.33, 1.77), (140.0, 0.45, 0.95)):
+            self.assertAlmostEqual(self.surface.query(S, sigma, T), bs_price(S, 100.0, T, 0.05, sigma, "Put"), delta=0.05)
+            self.assertAlmostEqual(self.surface.query(S, sigma, T, "delta"),
+                                   greeks(S, 100.0, T, 0.05, sigma, "Put")["delta"], delta=0.01)
+
+    def test_grid_points_are_exact(self):
+        S, sigma, T = (ax[7] for ax in self.surface.axes)
+        self.assertAlmostEqual(self.surface.query(S, sigma, T), self.surface.values["price"][7, 7, 7])
+
+    def test_array_query_and_slice(self):
+        prices = self.surface.query(np.array([90.0, 100.0, 110.0]), 0.2, 1.0)
+        self.assertEqual(prices.shape, (3,))
+        self.assertEqual(self.surface.slice_T(1.0).shape, (61, 46))
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestSurfaceCache(unittest.TestCase):
+    def wait(self, cache, *key):
+        for _ in range(200):
+            surface = cache.get(*key)
+            if surface is not None:
+                return surface
+            time.sleep(0.01)
+        self.fail("surface was not built")
+
+    def test_background_build_and_invalidation(self):
+        cache = SurfaceCache(shape=(11, 11, 11))
+        self.addCleanup(cache.close)
+        first = self.wait(cache, 100.0, 0.05, "Call")
+        self.assertIs(cache.get(100.0, 0.05, "Call"), first)
+        self.assertIsNone(cache.get(100.0, 0.05, "Put"))
+        second = self.wait(cache, 100.0, 0.05, "Put")
+        self.assertTrue(second.matches(100.0, 0.05, "Put"))
+
+    def test_build_error_is_raised(self):
+        cache = SurfaceCache(shape=(11, 11, 11), S_range="bad")
+        self.addCleanup(cache.close)
+        with self.assertRaises(ValueError):
+            for _ in range(200):
+                cache.get(100.0, 0.05, "Call")
+                time.sleep(0.01)
+        with self.assertRaises(ValueError):
+            cache.get(100.0, 0.05, "Call")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,4 +1,6 @@
+import math
 import unittest
+import calc
 from calc import Calculator
 
 class TestCalculator(unittest.TestCase):
@@ -30,5 +32,37 @@ class TestCalculator(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.calc.pow(2, 0)
 
+    def test_compute_cache(self):
+        c = Calculator(cache_size=2)
+        self.assertEqual(c.compute("pow", 3, 4), 81)
+        self.assertEqual(c.compute("pow", 3, 4), 81)
+        info = c.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        with self.assertRaises(ValueError):
+            c.compute("div", 1, 0)
+        self.assertIsNone(self.calc.cache_info())
+
+    def test_batch(self):
+        result, valid = self.calc.batch("div", [6, 1, 9], [3, 0, 3])
+        self.assertEqual(list(valid), [True, False, True])
+        self.assertEqual(result[0], 2.0)
+        self.assertTrue(math.isnan(result[1]))
+
+    def test_batch_pow_mask(self):
+        result, valid = self.calc.batch("pow", 2, [3, 0, -1])
+        self.assertEqual(list(valid), [True, False, False])
+        self.assertEqual(result[0], 8.0)
+
+    def test_batch_python_fallback(self):
+        result, valid = calc._batch_py("div", [1, 4], 2)
+        self.assertEqual(result, [0.5, 2.0])
+        self.assertEqual(valid, [True, True])
+        result, valid = calc._batch_py("pow", [-8, 2], [0.5, 0])
+        self.assertEqual(valid, [False, False])
+
+    def test_batch_unknown_op(self):
+        with self.assertRaises(ValueError):
+            self.calc.batch("mod", [1], [2])
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,42 @@
+import math
+import unittest
+from calc import Calculator
+from calc_expr import compile_expr
+
+class TestExpression(unittest.TestCase):
+    def test_scalar(self):
+        self.assertEqual(compile_expr("(a*b)+c/d").evaluate({"a": 2, "b": 3, "c": 1, "d": 4}), 6.25)
+        self.assertEqual(compile_expr("-a**2 + 1").evaluate({"a": 3}), -8)
+
+    def test_scalar_errors(self):
+        with self.assertRaises(ValueError):
+            compile_expr("a/b").evaluate({"a": 1, "b": 0})
+        with self.assertRaises(ValueError):
+            compile_expr("a/b").evaluate({"a": 1})
+
+    def test_rejects_other_syntax(self):
+        for text in ("a % b", "f(a)", "a.b", "'x' + a", "a +"):
+            with self.assertRaises(ValueError):
+                compile_expr(text)
+
+    def test_compiled_once(self):
+        self.assertIs(compile_expr("a+b"), compile_expr("a+b"))
+
+    def test_columns(self):
+        result, valid = compile_expr("(a*b)+c/d").evaluate_columns(
+            {"a": [1, 2, 3], "b": [2, 2, 2], "c": [3, 1, 4], "d": [4, 0, 2]})
+        self.assertEqual(list(valid), [True, False, True])
+        self.assertEqual(result[0], 2.75)
+        self.assertTrue(math.isnan(result[1]))
+        self.assertEqual(result[2], 8.0)
+
+    def test_columns_match_row_by_row(self):
+        expr = compile_expr("a**2 - 3*b + 1")
+        cols = {"a": [0.5, 1.5, -2.0], "b": [1.0, 2.0, 3.0]}
+        result, _ = expr.evaluate_columns(cols)
+        c = Calculator()
+        for i in range(3):
+            self.assertAlmostEqual(result[i], expr.evaluate({"a": cols["a"][i], "b": cols["b"][i]}, c))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,55 @@
+import pathlib, tempfile, threading, time, unittest
+from calc import Calculator, JsonlHistory
+from calc_server import CalcServer, request
+
+class TestCalcServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        d = pathlib.Path(self.tmp.name)
+        self.sock = d / "calc.sock"
+        self.calc = Calculator(JsonlHistory(d / "history.jsonl"))
+        self.server = CalcServer(self.sock, self.calc, interval=0.05)
+        self.thread = threading.Thread(target=self.server.run)
+        self.thread.start()
+        for _ in range(200):
+            if self.sock.exists():
+                break
+            time.sleep(0.01)
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            request(self.sock, {"op": "shutdown"})
+        self.thread.join(5)
+        self.tmp.cleanup()
+
+    def test_ops_and_errors(self):
+        self.assertEqual(request(self.sock, {"op": "mul", "a": 4, "b": 6}), {"result": 24})
+        self.assertIn("error", request(self.sock, {"op": "div", "a": 1, "b": 0}))
+        self.assertIn("error", request(self.sock, {"op": "mod", "a": 1, "b": 2}))
+        self.assertIn("error", request(self.sock, {"op": "pow", "a": 10.0, "b": 1e6}))
+        self.assertIn("error", request(self.sock, {"op": "pow", "a": -8, "b": 0.5}))
+        self.assertIn("error", request(self.sock, {"op": "pow", "a": 10, "b": 5000}))
+        for a, b in (("x", "y"), (True, 1), (None, 2), ([1], 2)):
+            self.assertIn("error", request(self.sock, {"op": "add", "a": a, "b": b}))
+        self.assertEqual(request(self.sock, {"op": "add", "a": 1, "b": 2}), {"result": 3})
+        # Rejected results are not buffered, so later history is still written
+        self.assertEqual(request(self.sock, {"op": "flush"}), {"ok": True})
+        self.assertEqual([(r["op"], r["result"]) for r in self.calc.history()], [("mul", 24), ("add", 3)])
+
+    def test_concurrent_clients(self):
+        def client(n):
+            for i in range(25):
+                request(self.sock, {"op": "add", "a": n, "b": i})
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        records = request(self.sock, {"op": "list"})["records"]
+        self.assertEqual(len(records), 200)
+        request(self.sock, {"op": "shutdown"})
+        self.thread.join(5)
+        self.assertEqual(len(self.calc.history()), 200)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
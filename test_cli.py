@@ -1,8 +1,15 @@
-﻿import json, subprocess, sys, os, unittest
-from calc import _HISTORY
+﻿import json, subprocess, sys, os, tempfile, unittest
+from unittest import mock
+from calc import Calculator, JsonlHistory
 class TestCLI(unittest.TestCase):
     def setUp(self):
-        if _HISTORY.exists(): _HISTORY.unlink()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.history = os.path.join(tmp.name, "history.jsonl")
+        # cli.py の子プロセスは CALC_HISTORY で一時ディレクトリの履歴を使う
+        patcher = mock.patch.dict(os.environ, CALC_HISTORY=self.history)
+        patcher.start()
+        self.addCleanup(patcher.stop)
     def test_cli_list(self):
         # add 1 2 を実行し履歴保存
         subprocess.run([sys.executable, "cli.py", "--add", "1", "2"], check=True)
@@ -10,5 +17,51 @@ class TestCLI(unittest.TestCase):
         out = subprocess.check_output([sys.executable, "cli.py", "--list"], text=True)
         data = json.loads(out)
         self.assertEqual(data[0]["result"], 3)
+    def test_cli_list_filters(self):
+        for args in (["--add", "1", "2"], ["--mul", "2", "3"], ["--add", "3", "4"]):
+            subprocess.run([sys.executable, "cli.py", *args], check=True)
+        out = subprocess.check_output(
+            [sys.executable, "cli.py", "--list", "--op", "add", "--offset", "1", "--limit", "1"], text=True)
+        self.assertEqual([r["result"] for r in json.loads(out)], [7])
+        out = subprocess.check_output([sys.executable, "cli.py", "--list", "--since", "2999-01-01"], text=True)
+        self.assertEqual(json.loads(out), [])
+    def test_cli_list_rejects_bad_filters(self):
+        for args, message in ((["--offset", "-1"], "must be 0 or greater"), (["--limit", "x"], "not an integer"),
+                              (["--since", "yesterday"], "not an ISO 8601")):
+            proc = subprocess.run([sys.executable, "cli.py", "--list", *args], capture_output=True, text=True)
+            self.assertEqual(proc.returncode, 2)
+            self.assertIn(message, proc.stderr)
+    def test_cli_since_with_timezone(self):
+        subprocess.run([sys.executable, "cli.py", "--add", "1", "2"], check=True)
+        for since, expected in (("2000-01-01T00:00:00+00:00", [3]), ("2999-01-01T00:00:00+09:00", [])):
+            out = subprocess.check_output([sys.executable, "cli.py", "--list", "--since", since], text=True)
+            self.assertEqual([r["result"] for r in json.loads(out)], expected)
+    def test_cli_rejects_options_without_effect(self):
+        for args, message in ((["--add", "1", "2", "--dedupe"], "--dedupe requires --db"),
+                              (["--add", "1", "2", "--cache-size", "8"], "--cache-size only applies to --serve")):
+            proc = subprocess.run([sys.executable, "cli.py", *args], capture_output=True, text=True)
+            self.assertEqual(proc.returncode, 2)
+            self.assertIn(message, proc.stderr)
+        self.assertFalse(os.path.exists(self.history))
+    def test_cli_dedupe_with_db(self):
+        with tempfile.TemporaryDirectory() as d:
+            db = os.path.join(d, "history.db")
+            for _ in range(3):
+                subprocess.run([sys.executable, "cli.py", "--db", db, "--dedupe", "--add", "1", "2"], check=True)
+            out = subprocess.check_output([sys.executable, "cli.py", "--db", db, "--list"], text=True)
+        self.assertEqual([(r["result"], r["count"]) for r in json.loads(out)], [(3, 3)])
+    def test_cli_connect_requires_op(self):
+        proc = subprocess.run([sys.executable, "cli.py", "--connect", "unused.sock"], capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("--connect requires", proc.stderr)
+    def test_cli_batch(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, "ops.csv")
+            with open(src, "w", encoding="utf-8") as f:
+                f.write("a,b\n6,3\n1,0\n9,3\n")
+            out = subprocess.check_output([sys.executable, "cli.py", "--batch", src, "--op", "div"], text=True)
+        self.assertEqual(out.split(), ["2.0", "nan", "3.0"])
+        # ゼロ除算の行は履歴に残らない
+        self.assertEqual([h["result"] for h in Calculator(JsonlHistory(self.history)).history()], [2.0, 3.0])
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -5,9 +5,17 @@ try:
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
     pd = None
 tempfile = __import__('tempfile')
+import json
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
-from dashboard import get_indicator_data
+import dashboard
+import dashboard_cache
+from dashboard import fetch_series, get_indicator_data, get_many
 
 SAMPLE_JSON = [
     {"date": "2020", "value": 1},
@@ -15,8 +23,17 @@ SAMPLE_JSON = [
     {"date": "2018", "value": 2},
 ]
 
+def mock_response():
+    res = Mock(status_code=200, headers={})
+    res.json.return_value = [None, SAMPLE_JSON]
+    res.raise_for_status = lambda: None
+    return res
+
 @unittest.skipIf(pd is None, "pandas not installed")
 class TestGetIndicatorData(unittest.TestCase):
+    def tearDown(self):
+        dashboard.close_caches()
+
     def test_load_from_cache(self):
         with tempfile.TemporaryDirectory() as d:
             p = Path(d) / "JPN_NY.GDP.MKTP.CD.csv"
@@ -25,35 +42,252 @@ class TestGetIndicatorData(unittest.TestCase):
                 df = get_indicator_data('JPN', 'NY.GDP.MKTP.CD', cache_dir=Path(d))
                 self.assertFalse(mock_get.called)
                 self.assertEqual(len(df), 2)
+                self.assertFalse(p.exists())
+                df = get_indicator_data('JPN', 'NY.GDP.MKTP.CD', cache_dir=Path(d))
+                self.assertFalse(mock_get.called)
+                self.assertEqual(list(df['date']), [2018, 2020])
+
+    def test_frame_cache_reopened_and_closed(self):
+        with tempfile.TemporaryDirectory() as d:
+            first = dashboard.frame_cache(Path(d))
+            self.assertIs(dashboard.frame_cache(Path(d)), first)
+            (Path(d) / 'frames.sqlite').unlink()
+            second = dashboard.frame_cache(Path(d))
+            self.assertIsNot(second, first)
+            with self.assertRaises(dashboard_cache.sqlite3.ProgrammingError):
+                first.stats()
+            dashboard.close_caches()
+            with self.assertRaises(dashboard_cache.sqlite3.ProgrammingError):
+                second.stats()
+            self.assertEqual(dashboard._caches, {})
 
     def test_fetch_from_api(self):
         with tempfile.TemporaryDirectory() as d:
-            mock_resp = Mock()
-            mock_resp.json.return_value = [None, SAMPLE_JSON]
-            mock_resp.raise_for_status = lambda: None
+            mock_resp = mock_response()
             with patch('dashboard.requests.get', return_value=mock_resp) as mock_get:
                 df = get_indicator_data('JPN', 'NY.GDP.MKTP.CD', cache_dir=Path(d))
                 mock_get.assert_called_once()
-                self.assertTrue((Path(d) / 'JPN_NY.GDP.MKTP.CD.csv').exists())
+                self.assertTrue((Path(d) / 'frames.sqlite').exists())
+                self.assertIsNotNone(dashboard.frame_cache(Path(d)).get('JPN_NY.GDP.MKTP.CD'))
                 self.assertEqual(list(df['date']), [2018, 2020])
 
     def test_sorted(self):
         with tempfile.TemporaryDirectory() as d:
-            mock_resp = Mock()
-            mock_resp.json.return_value = [None, SAMPLE_JSON]
-            mock_resp.raise_for_status = lambda: None
+            mock_resp = mock_response()
             with patch('dashboard.requests.get', return_value=mock_resp):
                 df = get_indicator_data('JPN', 'NY.GDP.MKTP.CD', cache_dir=Path(d))
                 self.assertEqual(list(df['date']), sorted(df['date']))
 
     def test_dropna(self):
         with tempfile.TemporaryDirectory() as d:
-            mock_resp = Mock()
-            mock_resp.json.return_value = [None, SAMPLE_JSON]
-            mock_resp.raise_for_status = lambda: None
+            mock_resp = mock_response()
             with patch('dashboard.requests.get', return_value=mock_resp):
                 df = get_indicator_data('JPN', 'NY.GDP.MKTP.CD', cache_dir=Path(d))
                 self.assertFalse(df['value'].isna().any())
 
+
+class FakeWorldBank:
+    """Local stand-in for the World Bank API, served from a thread."""
+
+    def __init__(self, series, fail_first=(), missing=(), etag=None, invalid=()):
+        self.series = series          # {(country, indicator): [{"date":..., "value":...}, ...]}
+        self.etag = etag
+        self.fail_first = set(fail_first)
+        self.missing = set(missing)
+        self.invalid = set(invalid)
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                parts = url.path.strip('/').split('/')
+                query = {k: int(v[0]) for k, v in parse_qs(url.query).items() if k in ('page', 'per_page')}
+                key = (parts[1], parts[3])
+                fake.requests.append(self.path)
+                if key in fake.fail_first:
+                    fake.fail_first.discard(key)
+                    return self.reply(503, {})
+                if key in fake.invalid:
+                    message = {"id": "120", "key": "Invalid value", "value": "The provided parameter value is not valid"}
+                    return self.reply(200, [{"message": [message]}])
+                if key in fake.missing:
+                    return self.reply(404, {})
+                if fake.etag and self.headers.get('If-None-Match') == fake.etag:
+                    return self.reply(304, None)
+                rows = fake.series.get(key, [])
+                per_page, page = query.get('per_page', 50), query.get('page', 1)
+                pages = max(1, -(-len(rows) // per_page))
+                meta = {"page": page, "pages": pages, "per_page": per_page, "total": len(rows)}
+                self.reply(200, [meta, rows[(page - 1) * per_page:page * per_page]])
+
+            def reply(self, status, body):
+                data = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                if fake.etag:
+                    self.send_header('ETag', fake.etag)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@unittest.skipIf(pd is None or dashboard.requests is None, "pandas/requests not installed")
+class TestGetMany(unittest.TestCase):
+    def setUp(self):
+        countries = [f"C{i:02d}" for i in range(12)]
+        series = {(c, i): [{"date": str(2000 + n), "value": n} for n in range(3)]
+                  for c in countries for i in dashboard.INDICATORS.values()}
+        self.countries = countries
+        self.fake = FakeWorldBank(series, fail_first=[("C03", "NY.GDP.MKTP.CD")], missing=[("C05", "EN.ATM.CO2E.PC")])
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        dashboard.close_caches()
+        self.fake.close()
+        self.tmp.cleanup()
+
+    def test_bulk_fetch_with_retry_and_progress(self):
+        seen = []
+        with patch('dashboard.time.sleep'):
+            result = get_many(self.countries, dashboard.INDICATORS.values(), cache_dir=Path(self.tmp.name),
+                              base_url=self.fake.url, max_workers=4, raise_errors=False,
+                              progress=lambda done, total, key, error: seen.append((done, total, key, error)))
+        self.assertEqual(len(result), 23)
+        self.assertNotIn(("C05", "EN.ATM.CO2E.PC"), result)
+        self.assertEqual(list(result[("C03", "NY.GDP.MKTP.CD")]["date"]), [2000, 2001, 2002])
+        self.assertEqual([d for d, *_ in seen], list(range(1, 25)))
+        self.assertEqual(sum(e is not None for *_, e in seen), 1)
+
+    def test_errors_raise_by_default(self):
+        with self.assertRaises(dashboard.requests.HTTPError):
+            get_many(["C05"], ["EN.ATM.CO2E.PC"], cache_dir=Path(self.tmp.name), base_url=self.fake.url)
+
+@unittest.skipIf(pd is None or dashboard.requests is None, "pandas/requests not installed")
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        rows = [{"date": str(2030 - n), "value": None if n % 7 == 0 else n} for n in range(95)]
+        self.fake = FakeWorldBank({("JPN", "NY.GDP.MKTP.CD"): rows})
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        dashboard.close_caches()
+        self.fake.close()
+        self.tmp.cleanup()
+
+    def test_follows_all_pages(self):
+        dates, values, _ = fetch_series('JPN', 'NY.GDP.MKTP.CD', base_url=self.fake.url, per_page=10)
+        self.assertEqual(len(self.fake.requests), 10)
+        self.assertEqual(dates, [str(2030 - n) for n in range(95)])
+        self.assertEqual(values[1], 1)
+
+    def test_dataframe_not_truncated(self):
+        with patch('dashboard.PER_PAGE', 20):
+            df = get_indicator_data('JPN', 'NY.GDP.MKTP.CD', cache_dir=Path(self.tmp.name), base_url=self.fake.url)
+        self.assertEqual(len(self.fake.requests), 5)
+        self.assertEqual(len(df), 95 - 14)
+        self.assertEqual(list(df['date']), sorted(df['date']))
+        self.assertEqual(df['date'].iloc[0], 1936)
+
+@unittest.skipIf(pd is None or dashboard.requests is None, "pandas/requests not installed")
+class TestErrorPayload(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeWorldBank({}, invalid=[("XXX", "NY.GDP.MKTP.CD")])
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        dashboard.close_caches()
+        self.fake.close()
+        self.tmp.cleanup()
+
+    def test_error_payload_raises_and_is_not_cached(self):
+        for _ in range(2):
+            with self.assertRaisesRegex(dashboard.APIError, 'not valid'):
+                get_indicator_data('XXX', 'NY.GDP.MKTP.CD', cache_dir=Path(self.tmp.name), base_url=self.fake.url)
+        self.assertEqual(len(self.fake.requests), 2)
+        self.assertIsNone(dashboard.frame_cache(Path(self.tmp.name)).get('XXX_NY.GDP.MKTP.CD'))
+
+
+@unittest.skipIf(pd is None or dashboard.requests is None, "pandas/requests not installed")
+class TestRevalidation(unittest.TestCase):
+    def setUp(self):
+        rows = [{"date": str(2000 + n), "value": n} for n in range(5)]
+        self.fake = FakeWorldBank({("JPN", "NY.GDP.MKTP.CD"): rows}, etag='"v1"')
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = dashboard.frame_cache(Path(self.tmp.name))
+
+    def tearDown(self):
+        dashboard.close_caches()
+        self.fake.close()
+        self.tmp.cleanup()
+
+    def fetch(self):
+        return get_indicator_data('JPN', 'NY.GDP.MKTP.CD', cache_dir=Path(self.tmp.name), base_url=self.fake.url)
+
+    def test_fresh_entry_skips_network(self):
+        self.fetch()
+        df = self.fetch()
+        self.assertEqual(len(self.fake.requests), 1)
+        self.assertEqual(list(df['value']), [0, 1, 2, 3, 4])
+
+    def test_expired_entry_revalidated(self):
+        self.fetch()
+        self.cache.ttl = -1
+        self.cache.renew('JPN_NY.GDP.MKTP.CD')
+        df = self.fetch()
+        self.assertEqual(len(self.fake.requests), 2)
+        self.assertEqual(len(df), 5)
+        self.assertEqual(self.cache.stats()['renewed'], 2)
+        self.fake.etag = '"v2"'
+        self.fetch()
+        self.assertEqual(self.cache.get('JPN_NY.GDP.MKTP.CD').etag, '"v2"')
+    def test_expired_entry_served_when_offline(self):
+        self.fetch()
+        self.cache.ttl = -1
+        self.cache.renew('JPN_NY.GDP.MKTP.CD')
+        self.fake.close()
+        df = self.fetch()
+        self.assertEqual(list(df['value']), [0, 1, 2, 3, 4])
+        self.assertFalse(self.cache.get('JPN_NY.GDP.MKTP.CD').fresh)
+
+    def test_missing_entry_raises_when_offline(self):
+        self.fake.close()
+        with self.assertRaises(dashboard.requests.RequestException):
+            self.fetch()
+
+class TestImportTime(unittest.TestCase):
+    """Cold import of the data layer stays cheap: heavy libraries load on first use."""
+
+    BUDGET_MS = 150
+    HEAVY = {'pandas', 'numpy', 'requests', 'matplotlib', 'pyarrow', 'tkinter'}
+
+    def test_cold_import_budget(self):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'from dashboard import get_indicator_data'],
+                              capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent)
+        times = {}
+        for line in proc.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+                _, cumulative, name = line.split('|')
+                times[name.strip()] = int(cumulative) / 1000
+        self.assertLess(times['dashboard'], self.BUDGET_MS)
+        self.assertFalse(self.HEAVY & {name.split('.')[0] for name in times})
+
+    def test_lazy_module_loads_on_use(self):
+        code = ("import sys, dashboard; assert 'pandas' not in sys.modules; "
+                "dashboard.pd.DataFrame; "
+                "assert 'pandas' in sys.modules")
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=Path(__file__).resolve().parent)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import pandas as pd
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    pd = None
+
+import dashboard_cache
+from dashboard_cache import FrameCache, MemoryLRU
+
+
+def frame(n):
+    return pd.DataFrame({"date": range(2000, 2000 + n), "value": [float(i) for i in range(n)]})
+
+
+@unittest.skipIf(pd is None, "pandas not installed")
+class TestFrameCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.now = 1000.0
+        self.cache = FrameCache(Path(self.tmp.name) / "frames.sqlite", ttl=60, clock=lambda: self.now)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_round_trip_and_stats(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", frame(5), etag='"x"')
+        entry = self.cache.get("a")
+        self.assertTrue(entry.fresh)
+        self.assertEqual(entry.etag, '"x"')
+        pd.testing.assert_frame_equal(entry.frame, frame(5))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_ttl_and_renew(self):
+        self.cache.put("a", frame(3))
+        self.now += 61
+        self.assertFalse(self.cache.get("a").fresh)
+        self.cache.renew("a")
+        self.assertTrue(self.cache.get("a").fresh)
+        self.assertEqual(self.cache.stats()["stale"], 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", frame(50))
+        size = self.cache.stats()["bytes"]
+        self.cache.max_bytes = 2 * size
+        self.now += 1
+        self.cache.put("b", frame(50))
+        self.now += 1
+        self.cache.get("a")
+        self.now += 1
+        self.cache.put("c", frame(50))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_npz_format(self):
+        cache = FrameCache(Path(self.tmp.name) / "npz.sqlite", fmt="npz")
+        cache.put("a", frame(4))
+        pd.testing.assert_frame_equal(cache.get("a").frame, frame(4))
+        cache.close()
+
+    @unittest.skipIf(dashboard_cache.feather is None, "pyarrow not installed")
+    def test_entries_survive_reopen(self):
+        self.cache.put("a", frame(4))
+        self.cache.close()
+        self.cache = FrameCache(Path(self.tmp.name) / "frames.sqlite")
+        pd.testing.assert_frame_equal(self.cache.get("a").frame, frame(4))
+
+
+class TestMemoryLRU(unittest.TestCase):
+    def test_drops_least_recently_used(self):
+        lru = MemoryLRU(maxsize=2)
+        lru.put("a", 1)
+        lru.put("b", 2)
+        self.assertEqual(lru.get("a"), 1)
+        lru.put("c", 3)
+        self.assertNotIn("b", lru)
+        self.assertEqual((lru.get("a"), lru.get("c"), len(lru)), (1, 3, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
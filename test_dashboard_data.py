@@ -0,0 +1,72 @@
+import subprocess
+import sys
+import unittest
+
+try:
+    import numpy as np
+    import pandas as pd
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = pd = None
+
+import dashboard
+from dashboard_data import Comparison
+
+GDP, CO2 = dashboard.INDICATORS["GDP"], dashboard.INDICATORS["CO2"]
+
+SERIES = {
+    ("AAA", GDP): {2000: 100.0, 2001: 110.0, 2003: 121.0},
+    ("BBB", GDP): {2001: 50.0, 2002: 200.0, 2003: 100.0},
+    ("AAA", CO2): {2000: 10.0, 2001: 10.0, 2002: 11.0, 2003: 11.0},
+    ("BBB", CO2): {2001: 5.0, 2002: 4.0, 2003: 5.0},
+}
+
+
+def fake_get_many(countries, indicators, max_workers=8, raise_errors=True):
+    fake_get_many.calls += 1
+    return {(c, i): pd.DataFrame({"date": list(SERIES[c, i]), "value": list(SERIES[c, i].values())})
+            for c in countries for i in indicators if (c, i) in SERIES}
+
+
+@unittest.skipIf(pd is None, "pandas not installed")
+class TestComparison(unittest.TestCase):
+    def setUp(self):
+        fake_get_many.calls = 0
+        self.cmp = Comparison(fake_get_many, dashboard.INDICATORS)
+
+    def test_wide_frame_is_aligned(self):
+        wide = self.cmp.wide(["AAA", "BBB", "ZZZ"], "GDP")
+        self.assertEqual(list(wide.index), [2000, 2001, 2002, 2003])
+        self.assertEqual(list(wide.columns), ["AAA", "BBB", "ZZZ"])
+        self.assertTrue(np.isnan(wide.loc[2002, "AAA"]))
+        self.assertTrue(wide["ZZZ"].isna().all())
+        self.assertEqual(wide.loc[2002, "BBB"], 200.0)
+
+    def test_derived_series(self):
+        growth = self.cmp.query(["AAA", "BBB"], "GDP", "growth")
+        self.assertAlmostEqual(growth.loc[2001, "AAA"], 10.0)
+        self.assertAlmostEqual(growth.loc[2003, "BBB"], -50.0)
+        rolling = self.cmp.query(["AAA", "BBB"], "GDP", "rolling", window=2)
+        self.assertAlmostEqual(rolling.loc[2002, "BBB"], 125.0)
+        rank = self.cmp.query(["AAA", "BBB"], "GDP", "rank")
+        self.assertEqual(list(rank.loc[2003]), [1.0, 2.0])
+        ratio = self.cmp.query(["AAA", "BBB"], "GDP", per="CO2")
+        self.assertAlmostEqual(ratio.loc[2003, "AAA"], 11.0)
+        self.assertAlmostEqual(ratio.loc[2003, "BBB"], 20.0)
+
+    def test_results_memoized(self):
+        first = self.cmp.query(["AAA", "BBB"], "GDP", "growth")
+        self.assertIs(self.cmp.query(["AAA", "BBB"], GDP, "growth"), first)
+        self.cmp.query(["AAA", "BBB"], "GDP", "rank")
+        self.assertEqual(fake_get_many.calls, 1)
+
+    def test_does_not_import_dashboard(self):
+        code = "import sys, dashboard_data; sys.exit('dashboard' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, "-c", code]).returncode, 0)
+
+    def test_unknown_transform(self):
+        with self.assertRaises(ValueError):
+            self.cmp.query(["AAA"], "GDP", "median")
+
+
+if __name__ == '__main__':
+    unittest.main()
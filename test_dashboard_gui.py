@@ -0,0 +1,174 @@
+import importlib
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+try:
+    import pandas as pd
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    pd = matplotlib = None
+
+import dashboard
+
+GDP, CO2 = dashboard.INDICATORS["GDP"], dashboard.INDICATORS["CO2"]
+
+
+class StubWidget:
+    def __init__(self, *args, **kw):
+        pass
+
+    def pack(self, *args, **kw):
+        pass
+
+
+class StubVar:
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class StubTk:
+    """Tk root whose after() only queues callbacks; :meth:`pump` runs them."""
+
+    def __init__(self):
+        self.after_queue = []
+
+    def title(self, text):
+        pass
+
+    def after(self, ms, callback):
+        self.after_queue.append(callback)
+
+    def destroy(self):
+        pass
+
+
+def stub_modules():
+    tk = types.ModuleType("tkinter")
+    tk.Tk, tk.StringVar = StubTk, StubVar
+    tk.TOP, tk.LEFT, tk.X, tk.BOTH = "top", "left", "x", "both"
+    ttk = types.ModuleType("tkinter.ttk")
+    for name in ("Frame", "Label", "Entry", "Combobox", "Radiobutton", "Button"):
+        setattr(ttk, name, StubWidget)
+    tk.ttk = ttk
+    tkagg = types.ModuleType("matplotlib.backends.backend_tkagg")
+
+    class FigureCanvasTkAgg(FigureCanvasAgg):
+        def __init__(self, figure, master=None):
+            super().__init__(figure)
+
+        def get_tk_widget(self):
+            return StubWidget()
+
+    tkagg.FigureCanvasTkAgg = FigureCanvasTkAgg
+    return {"tkinter": tk, "tkinter.ttk": ttk, "matplotlib.backends.backend_tkagg": tkagg}
+
+
+def frame(n):
+    return pd.DataFrame({"date": [2000, 2001, 2002], "value": [n, n + 1.0, n + 2.0]})
+
+
+@unittest.skipIf(pd is None or matplotlib is None, "pandas/matplotlib not installed")
+class TestDashboardLoading(unittest.TestCase):
+    def setUp(self):
+        # Only swap the stubbed names: restoring all of sys.modules would drop
+        # matplotlib submodules imported meanwhile and duplicate their classes.
+        stubs = dict(stub_modules(), dashboard_gui=None)
+        saved = {name: sys.modules.get(name) for name in stubs}
+        self.addCleanup(self.restore, saved)
+        sys.modules.update((name, module) for name, module in stubs.items() if module is not None)
+        sys.modules.pop("dashboard_gui", None)
+        self.gui = importlib.import_module("dashboard_gui")
+        self.calls = []
+        self.failing = set()
+        self.lock = threading.Lock()
+        loader = patch.object(self.gui, "get_indicator_data", self.load)
+        loader.start()
+        self.addCleanup(loader.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    @staticmethod
+    def restore(saved):
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+    def load(self, country, indicator, cache_dir):
+        with self.lock:
+            self.calls.append((country, indicator))
+        if (country, indicator) in self.failing:
+            raise dashboard.APIError("The provided parameter value is not valid")
+        return frame(len(self.calls))
+
+    def open(self):
+        app = self.gui.Dashboard(cache_dir=Path(self.tmp.name))
+        self.addCleanup(app.destroy)
+        return app
+
+    def pump(self, app):
+        for _ in range(500):
+            callbacks, app.after_queue = app.after_queue, []
+            for callback in callbacks:
+                callback()
+            if not app._pending and not app.after_queue:
+                return
+            time.sleep(0.01)
+        self.fail("loads did not finish")
+
+    def test_miss_loads_off_thread_then_redraws(self):
+        app = self.open()
+        self.assertEqual(app.status_var.get(), "Loading...")
+        self.assertEqual(app.renderer.full_draws, 0)
+        self.assertEqual(len(app.after_queue), 1)
+        self.pump(app)
+        self.assertEqual(app.status_var.get(), "")
+        self.assertEqual(app.ax.get_title(), "JPN GDP")
+        self.assertEqual(app.renderer.full_draws, 1)
+        self.assertFalse(app._polling)
+
+    def test_prefetches_other_indicator(self):
+        app = self.open()
+        self.pump(app)
+        self.assertEqual(sorted(self.calls), sorted([("JPN", GDP), ("JPN", CO2)]))
+        self.assertIn((("JPN",), CO2), app.frames)
+
+    def test_cache_hit_redraws_without_loading(self):
+        app = self.open()
+        self.pump(app)
+        calls = len(self.calls)
+        app.chart_type.set("scatter")
+        app.update_plot()
+        app.indicator_var.set("CO2")
+        app.update_plot()
+        self.assertEqual(len(self.calls), calls)
+        self.assertEqual(app.after_queue, [])
+        self.assertEqual(app.ax.get_title(), "JPN CO2")
+        self.assertEqual(len(app.ax.collections), 1)
+
+    def test_error_sets_status(self):
+        self.failing.add(("JPN", GDP))
+        app = self.open()
+        self.pump(app)
+        self.assertEqual(app.status_var.get(), "Error: The provided parameter value is not valid")
+        self.assertEqual(app.renderer.full_draws, 0)
+        self.assertIn((("JPN",), CO2), app.frames)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+try:
+    import numpy as np
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = plt = None
+
+from dashboard_plot import SeriesRenderer, decimate
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestDecimate(unittest.TestCase):
+    def test_short_series_untouched(self):
+        x = np.arange(10)
+        dx, dy = decimate(x, x * 2.0, 100)
+        self.assertIs(dx, x)
+
+    def test_keeps_envelope(self):
+        rng = np.random.default_rng(0)
+        x = np.arange(100_003)
+        y = rng.standard_normal(len(x))
+        y[5000:7000] = np.nan
+        dx, dy = decimate(x, y, 500)
+        self.assertLessEqual(len(dx), 1000)
+        self.assertEqual(np.nanmax(dy), np.nanmax(y))
+        self.assertEqual(np.nanmin(dy), np.nanmin(y))
+        self.assertTrue(np.all(np.diff(dx) >= 0))
+        self.assertTrue(np.isnan(dy).any())
+
+
+@unittest.skipIf(plt is None, "matplotlib not installed")
+class TestSeriesRenderer(unittest.TestCase):
+    def setUp(self):
+        self.fig, self.ax = plt.subplots()
+        self.renderer = SeriesRenderer(self.fig, self.ax)
+        self.x = np.arange(1960, 2024)
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def render(self, scale=1.0, kind="line", title="JPN GDP"):
+        self.renderer.render({"JPN": (self.x, scale * np.sin(self.x)), "USA": (self.x, scale * np.cos(self.x))},
+                             kind, title, "Year", "GDP")
+
+    def test_data_only_change_blits(self):
+        self.render()
+        lines = dict(self.renderer.artists)
+        self.render(0.9)
+        self.assertEqual((self.renderer.full_draws, self.renderer.blits), (1, 1))
+        self.assertEqual(self.renderer.artists, lines)
+        np.testing.assert_allclose(lines["JPN"].get_ydata(), 0.9 * np.sin(self.x))
+
+    def test_redraws_when_view_or_labels_change(self):
+        self.render()
+        self.render(5.0)
+        self.render(5.0, title="other")
+        self.render(5.0, kind="scatter")
+        self.assertEqual((self.renderer.full_draws, self.renderer.blits), (4, 0))
+        self.assertEqual(len(self.ax.lines), 0)
+        self.assertEqual(len(self.ax.collections), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
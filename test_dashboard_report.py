@@ -0,0 +1,67 @@
+import csv
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+try:
+    import pandas as pd
+    import matplotlib
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    pd = matplotlib = None
+
+import dashboard
+import dashboard_report
+
+GDP = dashboard.INDICATORS["GDP"]
+
+
+def fake_get_many(countries, indicators, cache_dir, progress=None, raise_errors=True):
+    result = {}
+    for n, key in enumerate((c, i) for c in countries for i in indicators):
+        error = dashboard.requests.HTTPError("404") if key[0] == "ZZZ" else None
+        if error is None:
+            result[key] = pd.DataFrame({"date": [2000, 2001, 2002], "value": [100.0, 110.0, 121.0]})
+        progress(n + 1, len(countries) * len(indicators), key, error)
+    return result
+
+
+@unittest.skipIf(pd is None or matplotlib is None or dashboard.requests is None,
+                 "pandas/matplotlib/requests not installed")
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_charts_and_summary(self):
+        with patch('dashboard.get_many', fake_get_many):
+            code = dashboard.main(['report', 'JPN', 'USA', 'ZZZ', '--indicators', 'GDP', '-o', str(self.out),
+                                   '--format', 'svg', '--workers', '2'])
+        self.assertEqual(code, 1)
+        self.assertTrue((self.out / 'JPN_GDP.svg').exists())
+        self.assertTrue((self.out / 'USA_GDP.svg').exists())
+        with open(self.out / 'summary.csv', newline='') as f:
+            rows = {row['country']: row for row in csv.DictReader(f)}
+        self.assertEqual(rows['JPN']['code'], GDP)
+        self.assertEqual(rows['JPN']['points'], '3')
+        self.assertAlmostEqual(float(rows['JPN']['cagr_pct']), 10.0)
+        self.assertEqual(rows['ZZZ']['chart'], '')
+        self.assertIn('404', rows['ZZZ']['error'])
+
+    def test_summarize_empty(self):
+        self.assertEqual(dashboard_report.summarize(pd.DataFrame({"date": [], "value": []})), {"points": 0})
+
+
+class TestHeadless(unittest.TestCase):
+    def test_no_tkinter_import(self):
+        code = "import sys, dashboard, dashboard_report; assert 'tkinter' not in sys.modules"
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=Path(__file__).resolve().parent)
+
+
+if __name__ == '__main__':
+    unittest.main()
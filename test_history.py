@@ -1,15 +1,167 @@
-﻿import unittest, json, pathlib
-from calc import Calculator, _HISTORY
+﻿import unittest, datetime, gc, json, multiprocessing, pathlib, sqlite3, tempfile, weakref
+from unittest import mock
+import calc
+from calc import Calculator, JsonlHistory, SqliteHistory
 class TestHistory(unittest.TestCase):
     def setUp(self):
-        if _HISTORY.exists():
-            _HISTORY.unlink()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch("calc._HISTORY", pathlib.Path(self.tmp.name) / "history.jsonl")
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.c = Calculator()
     def test_save_and_load(self):
         r = self.c.add(2, 3)
         self.c.save("add", 2, 3, r)
         hist = self.c.history()
         self.assertEqual(hist[0]["result"], 5)
-        self.assertTrue(_HISTORY.exists())
+        self.assertTrue(calc._HISTORY.exists())
+    def test_buffered_stores_flushed_at_exit_without_being_kept_alive(self):
+        path = pathlib.Path(self.tmp.name) / "buffered.jsonl"
+        store = JsonlHistory(path, buffer_size=10)
+        store.append([{"op": "add", "a": 1, "b": 2, "result": 3}])
+        self.assertIn(store, calc._BUFFERED)
+        calc._flush_buffered()
+        self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 1)
+        store.append([{"op": "add", "a": 2, "b": 2, "result": 4}])
+        ref = weakref.ref(store)
+        del store
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 2)
+def _worker(path, n, count):
+    c = Calculator(JsonlHistory(path, buffer_size=7))
+    for i in range(count):
+        c.save("add", n, i, n + i)
+        if n == 0 and i % 50 == 0:
+            c.store.compact()
+    c.flush()
+class TestJsonlHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tmp.name) / "history.jsonl"
+        self.c = Calculator(JsonlHistory(self.path))
+    def tearDown(self):
+        self.tmp.cleanup()
+    def test_append_only(self):
+        self.c.save("add", 1, 2, 3)
+        self.c.save("mul", 2, 3, 6)
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(l)["op"] for l in lines], ["add", "mul"])
+        self.assertEqual(self.c.history()[1]["result"], 6)
+    def test_migrate_legacy_json(self):
+        legacy = self.path.with_suffix(".json")
+        legacy.write_text(json.dumps([{"op": "sub", "a": 3, "b": 1, "result": 2}]), encoding="utf-8")
+        self.c.save("add", 1, 1, 2)
+        self.assertFalse(legacy.exists())
+        self.assertEqual([h["op"] for h in self.c.history()], ["sub", "add"])
+    def test_torn_line_is_dropped(self):
+        self.c.save("add", 1, 2, 3)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"op": "ad')
+        self.c.save("mul", 2, 2, 4)
+        self.assertEqual([h["op"] for h in self.c.history()], ["add", "mul"])
+        self.assertEqual(len(self.path.read_text(encoding="utf-8").splitlines()), 2)
+    def test_iter_history_filters(self):
+        for i in range(5):
+            self.c.save("add" if i % 2 == 0 else "mul", i, i, i)
+        self.assertEqual([h["a"] for h in self.c.iter_history(op="add")], [0, 2, 4])
+        self.assertEqual([h["a"] for h in self.c.iter_history(offset=1, limit=2)], [1, 2])
+        future = datetime.datetime(2999, 1, 1)
+        self.assertEqual(list(self.c.iter_history(since=future)), [])
+    def test_buffered_writes(self):
+        c = Calculator(JsonlHistory(self.path, buffer_size=3))
+        c.save("add", 1, 1, 2)
+        c.save("add", 1, 2, 3)
+        self.assertFalse(self.path.exists())
+        c.save("add", 1, 3, 4)
+        self.assertEqual(len(self.path.read_text(encoding="utf-8").splitlines()), 3)
+        c.save("add", 1, 4, 5)
+        self.assertEqual(len(c.history()), 4)
+    def test_parallel_processes_lose_nothing(self):
+        legacy = self.path.with_suffix(".json")
+        legacy.write_text(json.dumps([{"op": "sub", "a": -1, "b": 0, "result": -1}]), encoding="utf-8")
+        procs = [multiprocessing.Process(target=_worker, args=(self.path, n, 200)) for n in range(6)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        hist = self.c.history()
+        self.assertEqual(len(hist), 1 + 6 * 200)
+        self.assertEqual(len({(h["a"], h["b"]) for h in hist}), 1 + 6 * 200)
+        self.assertFalse(legacy.exists())
+    def test_dedupe_counts_repeats(self):
+        c = Calculator(JsonlHistory(self.path, dedupe=True))
+        c.save_many([("pow", 2, 10, 1024)] * 3 + [("add", 1, 1, 2)])
+        c.save("pow", 2, 10, 1024)
+        self.assertEqual(len(self.path.read_text(encoding="utf-8").splitlines()), 3)
+        c.store.compact()
+        hist = c.history()
+        self.assertEqual([(h["op"], h.get("count", 1)) for h in hist], [("pow", 4), ("add", 1)])
+        self.assertEqual(c.stats(op="pow")[0]["count"], 4)
+    def test_dedupe_since_uses_last_occurrence(self):
+        store = JsonlHistory(self.path, dedupe=True)
+        store.append([{"op": "add", "a": 1, "b": 2, "result": 3, "ts": "2020-01-01T00:00:00"}])
+        c = Calculator(store)
+        for _ in range(5):
+            c.save("add", 1, 2, 3)
+        c.store.compact()
+        since = datetime.datetime(2025, 1, 1)
+        [record] = c.iter_history(since=since)
+        self.assertEqual((record["ts"], record["count"]), ("2020-01-01T00:00:00", 6))
+        self.assertEqual(c.stats(since=since)[0]["count"], 6)
+        self.assertEqual(list(c.iter_history(since=datetime.datetime(2999, 1, 1))), [])
+class TestSqliteHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        d = pathlib.Path(self.tmp.name)
+        self.sql = Calculator(SqliteHistory(d / "history.db"))
+        self.jsonl = Calculator(JsonlHistory(d / "history.jsonl"))
+        rows = [("add", 1, 2, 3), ("div", 1, 4, 0.25), ("add", 2, 2, 4), ("mul", 3, 3, 9)]
+        for c in (self.sql, self.jsonl):
+            c.save_many(rows)
+    def tearDown(self):
+        self.sql.store._conn.close()
+        self.tmp.cleanup()
+    def test_same_interface(self):
+        self.assertEqual(self.sql.history(), self.jsonl.history())
+        self.assertEqual(list(self.sql.iter_history(op="add", offset=1)), list(self.jsonl.iter_history(op="add", offset=1)))
+        self.assertEqual(list(self.sql.iter_history(since=datetime.datetime(2999, 1, 1))), [])
+    def test_stats(self):
+        stats = self.sql.stats()
+        self.assertEqual(stats, self.jsonl.stats())
+        self.assertEqual([(s["op"], s["count"], s["sum"]) for s in stats], [("add", 2, 7), ("div", 1, 0.25), ("mul", 1, 9)])
+    def test_dedupe_counts_repeats(self):
+        c = Calculator(SqliteHistory(pathlib.Path(self.tmp.name) / "dedupe.db", dedupe=True))
+        c.save_many([("pow", 2, 10, 1024)] * 3)
+        c.save("pow", 2, 10, 1024)
+        c.save("add", 1, 1, 2)
+        self.assertEqual([(h["op"], h.get("count", 1)) for h in c.history()], [("pow", 4), ("add", 1)])
+        self.assertEqual(c.stats()[1]["sum"], 4096)
+        c.store._conn.close()
+    def test_dedupe_since_uses_last_occurrence(self):
+        c = Calculator(SqliteHistory(pathlib.Path(self.tmp.name) / "dedupe.db", dedupe=True))
+        c.store.append([{"op": "add", "a": 1, "b": 2, "result": 3, "ts": "2020-01-01T00:00:00"}])
+        for _ in range(5):
+            c.save("add", 1, 2, 3)
+        since = datetime.datetime(2025, 1, 1)
+        [record] = c.iter_history(since=since)
+        self.assertEqual((record["ts"], record["count"]), ("2020-01-01T00:00:00", 6))
+        self.assertGreaterEqual(record["last_ts"], since.isoformat())
+        self.assertEqual(c.stats(since=since)[0]["count"], 6)
+        self.assertEqual(list(c.iter_history(since=datetime.datetime(2999, 1, 1))), [])
+        c.store._conn.close()
+    def test_old_database_gets_last_ts(self):
+        path = pathlib.Path(self.tmp.name) / "old.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE history (id INTEGER PRIMARY KEY, op TEXT NOT NULL, a, b, result, ts TEXT)")
+            conn.execute("INSERT INTO history (op, a, b, result, ts) VALUES ('add', 1, 2, 3, '2024-05-01T00:00:00')")
+        conn.close()
+        c = Calculator(SqliteHistory(path))
+        self.assertEqual(len(list(c.iter_history(since=datetime.datetime(2024, 1, 1)))), 1)
+        c.store._conn.close()
+    def test_op_query_uses_index(self):
+        plan = self.sql.store._conn.execute("EXPLAIN QUERY PLAN SELECT * FROM history WHERE op = 'add'").fetchall()
+        self.assertIn("history_op_ts", str(plan))
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from journal import append_lines, rewrite_lines
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / 'log.jsonl'
+
+    def test_append_starts_after_torn_line(self):
+        append_lines(self.path, b'1\n')
+        with open(self.path, 'ab') as f:
+            f.write(b'{"half')
+        append_lines(self.path, b'2\n3\n')
+        self.assertEqual(self.path.read_bytes(), b'1\n{"half\n2\n3\n')
+
+    def test_rewrite_replaces_contents(self):
+        append_lines(self.path, b'old\n')
+        rewrite_lines(self.path, ['a\n', 'b\n'])
+        self.assertEqual(self.path.read_text(encoding='utf-8'), 'a\nb\n')
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [self.path])
+
+    def test_failed_rewrite_keeps_old_contents(self):
+        append_lines(self.path, b'old\n')
+        with patch('journal.os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                rewrite_lines(self.path, ['new\n'])
+        self.assertEqual(self.path.read_bytes(), b'old\n')
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [self.path])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+from lazy import LazyModule, lazy_import
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_missing_module_is_none(self):
+        self.assertIsNone(lazy_import("no_such_module_xyz"))
+        self.assertIsNone(lazy_import("no_such_module_xyz.sub"))
+
+    def test_proxies_real_module(self):
+        mod = lazy_import("colorsys")
+        self.assertIsInstance(mod, LazyModule)
+        self.assertEqual(mod.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertIs(mod._load(), sys.modules["colorsys"])
+
+    def test_patch_through_proxy(self):
+        mod = lazy_import("colorsys")
+        original = sys.modules["colorsys"].hls_to_rgb if "colorsys" in sys.modules else mod.hls_to_rgb
+        with patch.object(mod, "hls_to_rgb", return_value="patched"):
+            self.assertEqual(sys.modules["colorsys"].hls_to_rgb(0, 0, 0), "patched")
+        self.assertIs(sys.modules["colorsys"].hls_to_rgb, original)
+
+
+if __name__ == '__main__':
+    unittest.main()
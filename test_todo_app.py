@@ -0,0 +1,128 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import todo_app
+from todo_app import Task, TaskRepository, load_tasks, save_tasks
+
+
+def task(n, **kw):
+    return Task(id=f't{n:06d}', title=f'task {n}', **kw)
+
+
+class TestTaskRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.journal = self.dir / 'todo_data.jsonl'
+        self.legacy = self.dir / 'todo_data.json'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, **kw):
+        return TaskRepository(self.journal, self.legacy, **kw)
+
+    def test_changes_survive_reopen(self):
+        repo = self.open()
+        repo.put_many([task(1, due='2024-05-01'), task(2, priority=3), task(3)])
+        repo.update('t000002', completed=True)
+        repo.delete('t000003')
+        reopened = self.open()
+        self.assertEqual([t.id for t in reopened], ['t000001', 't000002'])
+        self.assertTrue(reopened.get('t000002').completed)
+        self.assertIsNone(reopened.get('t000003'))
+
+    def test_indexes_follow_updates(self):
+        repo = self.open()
+        repo.put_many([task(1, due='2024-05-01', priority=2), task(2, due='2024-06-01'), task(3, priority=2)])
+        repo.update('t000001', completed=True, priority=5, due='2024-07-01')
+        self.assertEqual([t.id for t in repo], ['t000001', 't000002', 't000003'])
+        self.assertEqual([t.id for t in repo.completed(True)], ['t000001'])
+        self.assertEqual([t.id for t in repo.completed(False)], ['t000002', 't000003'])
+        self.assertEqual([t.id for t in repo.with_priority(2)], ['t000003'])
+        self.assertEqual([t.id for t in repo.due_between('2024-06-01', '2024-06-30')], ['t000002'])
+        self.assertEqual([t.id for t in repo.due_between()], ['t000002', 't000001'])
+        repo.delete('t000002')
+        self.assertEqual(repo.due_between('2024-01-01', '2024-12-31'), [repo.get('t000001')])
+
+    def test_journal_is_appended_and_compacted(self):
+        repo = self.open(compact_ratio=1.0)
+        repo.put(task(1))
+        size = self.journal.stat().st_size
+        repo.update('t000001', title='renamed')
+        self.assertGreater(self.journal.stat().st_size, size)
+        for n in range(150):
+            repo.update('t000001', priority=n % 5 + 1)
+        self.assertLess(len(self.journal.read_text(encoding='utf-8').splitlines()), 110)
+        self.assertEqual(self.open().get('t000001').title, 'renamed')
+
+    def test_torn_last_line_is_ignored(self):
+        repo = self.open()
+        repo.put_many([task(1), task(2)])
+        with open(self.journal, 'a', encoding='utf-8') as f:
+            f.write('{"op": "put", "task": {"id": "t0')
+        repo = self.open()
+        self.assertEqual(len(repo), 2)
+        repo.put(task(3))
+        self.assertEqual(len(self.open()), 3)
+
+    def test_malformed_entries_are_skipped_and_counted(self):
+        lines = [
+            {'op': 'put', 'task': {'id': 'a', 'title': 'kept'}},
+            {'op': 'archive', 'id': 'a'},
+            {'op': 'put', 'task': {'id': 'b', 'title': 'x', 'colour': 'red'}},
+            {'op': 'put', 'task': {'id': 'c', 'title': 'x', 'priority': 'high'}},
+            {'op': 'put', 'task': 'd'},
+            {'op': 'del'},
+            {'op': 'del', 'id': ['a']},
+            [1, 2],
+        ]
+        self.journal.write_text(''.join(json.dumps(e) + '\n' for e in lines) + '\n{"op": "del", "id"',
+                                encoding='utf-8')
+        repo = self.open()
+        self.assertEqual([t.id for t in repo], ['a'])
+        self.assertEqual(repo.skipped, 8)
+        repo.compact()
+        reopened = self.open()
+        self.assertEqual(reopened.skipped, 0)
+        self.assertEqual(reopened.get('a').title, 'kept')
+
+    def test_legacy_json_is_migrated(self):
+        self.legacy.write_text(json.dumps([{'id': 'a', 'title': 'old', 'completed': True}]), encoding='utf-8')
+        repo = self.open()
+        self.assertTrue(repo.get('a').completed)
+        self.assertFalse(self.legacy.exists())
+        self.assertEqual(len(self.open()), 1)
+
+    def test_compat_wrappers(self):
+        with patch('todo_app.JOURNAL_FILE', self.journal), patch('todo_app.DATA_FILE', self.legacy):
+            save_tasks([task(1), task(2)])
+            save_tasks([task(2)])
+            self.assertEqual([t.id for t in load_tasks()], ['t000002'])
+
+    def test_writes_scale_with_changes_not_tasks(self):
+        repo = self.open(autoflush=False)
+        repo.put_many(task(n, due=f'2024-{n % 12 + 1:02d}-01', priority=n % 5 + 1) for n in range(20_000))
+        repo.flush()
+        size = self.journal.stat().st_size
+        with patch('todo_app.append_lines', wraps=todo_app.append_lines) as append, \
+                patch('todo_app.rewrite_lines', wraps=todo_app.rewrite_lines) as rewrite:
+            for n in range(0, 20_000, 20):
+                repo.update(f't{n:06d}', completed=True)
+                repo.delete(f't{n + 1:06d}')
+            self.assertEqual(self.journal.stat().st_size, size)
+            repo.flush()
+        # One append holding exactly the 2,000 changes; the journal is not rewritten
+        self.assertEqual(append.call_count, 1)
+        self.assertEqual(append.call_args.args[1].count(b'\n'), 2_000)
+        rewrite.assert_not_called()
+        self.assertEqual(len(repo.completed(True)), 1_000)
+        self.assertEqual(len(repo.due_between('2024-01-01', '2024-01-31')), 1_667)
+        self.assertEqual(len(self.open()), 19_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
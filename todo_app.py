@@ -1,12 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from dataclasses import dataclass, asdict
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, replace
 import json
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional
 import uuid
 
+from journal import append_lines, rewrite_lines
+
 DATA_FILE = Path(__file__).with_name('todo_data.json')
+JOURNAL_FILE = Path(__file__).with_name('todo_data.jsonl')
 
 @dataclass
 class Task:
@@ -18,24 +22,208 @@ class Task:
     completed: bool = False
 
 
+class TaskRepository:
+    """Tasks keyed by id, with indexes on completed, priority and due date.
+
+    Every change is appended to a JSON Lines journal (``put`` or ``del``
+    entries), so saving costs the size of the change rather than of the whole
+    list.  Opening replays the journal; once it holds more than
+    ``compact_ratio`` entries per task it is rewritten with one ``put`` per
+    task (temporary file + fsync + os.replace).  Lines that are not a valid
+    ``put``/``del`` entry are skipped on open and counted in ``skipped``.
+    A ``todo_data.json`` from older versions is imported on first open and
+    then removed.
+
+    With ``autoflush=False`` changes stay in memory until :meth:`flush`.
+    """
+
+    def __init__(self, path: Optional[Path] = None, legacy: Optional[Path] = None,
+                 autoflush: bool = True, compact_ratio: float = 2.0) -> None:
+        self.path = Path(path) if path is not None else JOURNAL_FILE
+        self.legacy = Path(legacy) if legacy is not None else DATA_FILE
+        self.autoflush = autoflush
+        self.compact_ratio = compact_ratio
+        self.tasks: Dict[str, Task] = {}
+        self.by_completed: Dict[bool, Dict[str, Task]] = {False: {}, True: {}}
+        self.by_priority: Dict[int, Dict[str, Task]] = {}
+        self.by_due: Dict[str, Dict[str, Task]] = {}
+        self._due_keys: List[str] = []
+        self._pending: List[dict] = []
+        self._entries = 0
+        self.skipped = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(list(self.tasks.values()))
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.tasks
+
+    def get(self, task_id: str) -> Optional[Task]:
+        return self.tasks.get(task_id)
+
+    def put(self, task: Task) -> None:
+        """Add ``task`` or replace the task with the same id."""
+        self.put_many([task])
+
+    def put_many(self, tasks: Iterable[Task]) -> None:
+        for task in tasks:
+            self._index(task)
+            self._pending.append({'op': 'put', 'task': dict(vars(task))})
+        self._changed()
+
+    def update(self, task_id: str, **changes) -> Task:
+        task = replace(self.tasks[task_id], **changes)
+        self.put(task)
+        return task
+
+    def delete(self, task_id: str) -> Optional[Task]:
+        task = self._unindex(task_id)
+        if task is not None:
+            self._pending.append({'op': 'del', 'id': task_id})
+            self._changed()
+        return task
+
+    def completed(self, flag: bool = True) -> List[Task]:
+        return list(self.by_completed[flag].values())
+
+    def with_priority(self, priority: int) -> List[Task]:
+        return list(self.by_priority.get(priority, {}).values())
+
+    def due_between(self, start: str = '', end: Optional[str] = None) -> List[Task]:
+        """Tasks whose ``due`` string sorts within [start, end]; tasks without a due date are skipped."""
+        lo = bisect_left(self._due_keys, start)
+        hi = len(self._due_keys) if end is None else bisect_right(self._due_keys, end)
+        return [task for due in self._due_keys[lo:hi] for task in self.by_due[due].values()]
+
+    def flush(self) -> None:
+        """Append pending changes to the journal, compacting it when it has grown too long."""
+        if not self._pending:
+            return
+        data = ''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in self._pending).encode('utf-8')
+        append_lines(self.path, data)
+        self._entries += len(self._pending)
+        self._pending = []
+        if self._entries > self.compact_ratio * len(self.tasks) + 100:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the journal with exactly one entry per task."""
+        self._pending = []
+        rewrite_lines(self.path, (json.dumps({'op': 'put', 'task': dict(vars(task))}, ensure_ascii=False) + '\n'
+                                  for task in self.tasks.values()))
+        self._entries = len(self.tasks)
+
+    def replace_all(self, tasks: Iterable[Task]) -> None:
+        """Make ``tasks`` the whole contents and write a compacted journal."""
+        for task_id in list(self.tasks):
+            self._unindex(task_id)
+        for task in tasks:
+            self._index(task)
+        self.compact()
+
+    def _changed(self) -> None:
+        if self.autoflush:
+            self.flush()
+
+    def _index(self, task: Task) -> None:
+        # Replacing keeps a task's position in every index whose key is unchanged
+        old = self.tasks.get(task.id)
+        if old is not None:
+            self._drop_keys(old, task)
+        self.tasks[task.id] = task
+        self.by_completed[bool(task.completed)][task.id] = task
+        self.by_priority.setdefault(task.priority, {})[task.id] = task
+        if task.due:
+            same = self.by_due.get(task.due)
+            if same is None:
+                same = self.by_due[task.due] = {}
+                insort(self._due_keys, task.due)
+            same[task.id] = task
+
+    def _unindex(self, task_id: str) -> Optional[Task]:
+        task = self.tasks.pop(task_id, None)
+        if task is not None:
+            self._drop_keys(task)
+        return task
+
+    def _drop_keys(self, task: Task, new: Optional[Task] = None) -> None:
+        """Remove ``task`` from the secondary indexes whose key ``new`` does not share."""
+        if new is None or bool(new.completed) != bool(task.completed):
+            del self.by_completed[bool(task.completed)][task.id]
+        if new is None or new.priority != task.priority:
+            same = self.by_priority[task.priority]
+            del same[task.id]
+            if not same:
+                del self.by_priority[task.priority]
+        if task.due and (new is None or new.due != task.due):
+            same = self.by_due[task.due]
+            del same[task.id]
+            if not same:
+                del self.by_due[task.due]
+                del self._due_keys[bisect_left(self._due_keys, task.due)]
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            if self.legacy.exists():
+                data = json.loads(self.legacy.read_text(encoding='utf-8'))
+                self.replace_all(Task(**t) for t in data)
+                self.legacy.unlink()
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                self._entries += 1
+                if not self._replay(line):
+                    self.skipped += 1
+
+    def _replay(self, line: str) -> bool:
+        """Apply one journal line; False if it is half-written, malformed or of an unknown op."""
+        try:
+            entry = json.loads(line)
+            op = entry['op']
+            if op == 'put':
+                task = Task(**entry['task'])
+                if not _well_typed(task):
+                    return False
+            elif op == 'del':
+                task_id = entry['id']
+                if not isinstance(task_id, str):
+                    return False
+            else:
+                return False
+        except (ValueError, TypeError, KeyError):
+            return False
+        if op == 'put':
+            self._index(task)
+        else:
+            self._unindex(task_id)
+        return True
+
+
+def _well_typed(task: Task) -> bool:
+    return (all(isinstance(v, str) for v in (task.id, task.title, task.desc, task.due))
+            and type(task.priority) is int and isinstance(task.completed, bool))
+
+
 def load_tasks() -> List[Task]:
-    if DATA_FILE.exists():
-        data = json.loads(DATA_FILE.read_text(encoding='utf-8'))
-        return [Task(**t) for t in data]
-    return []
+    return list(TaskRepository())
 
 
 def save_tasks(tasks: List[Task]) -> None:
-    DATA_FILE.write_text(
-        json.dumps([asdict(t) for t in tasks], ensure_ascii=False, indent=2),
-        encoding='utf-8')
+    TaskRepository().replace_all(tasks)
 
 
 class TodoApp:
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
         root.title('To-Do App')
-        self.tasks: List[Task] = load_tasks()
+        # Changes are written when Save is pressed, as before the journal
+        self.repo = TaskRepository(autoflush=False)
         self.filter_var = tk.StringVar(value='All')
         self.search_var = tk.StringVar()
         self._build_ui()
@@ -81,7 +269,7 @@ class TodoApp:
             messagebox.showwarning('Validation', 'Title is required')
             return
         task = Task(id=str(uuid.uuid4()), title=title, desc=self.desc_var.get(), due=self.due_var.get(), priority=self.pri_var.get())
-        self.tasks.append(task)
+        self.repo.put(task)
         self.clear_inputs()
         self.refresh()
 
@@ -94,11 +282,12 @@ class TodoApp:
     def get_filtered(self) -> List[Task]:
         q = self.search_var.get().lower()
         flt = self.filter_var.get()
-        tasks = self.tasks
         if flt == 'Active':
-            tasks = [t for t in tasks if not t.completed]
+            tasks = self.repo.completed(False)
         elif flt == 'Completed':
-            tasks = [t for t in tasks if t.completed]
+            tasks = self.repo.completed(True)
+        else:
+            tasks = list(self.repo)
         if q:
             tasks = [t for t in tasks if q in t.title.lower() or q in t.desc.lower()]
         return tasks
@@ -120,26 +309,22 @@ class TodoApp:
         sel = self.tree.selection()
         if not sel:
             return None
-        id_ = sel[0]
-        for t in self.tasks:
-            if t.id == id_:
-                return t
-        return None
+        return self.repo.get(sel[0])
 
     def toggle_done(self) -> None:
         t = self.get_selected()
         if t:
-            t.completed = not t.completed
+            self.repo.update(t.id, completed=not t.completed)
             self.refresh()
 
     def delete_task(self) -> None:
         t = self.get_selected()
         if t:
-            self.tasks.remove(t)
+            self.repo.delete(t.id)
             self.refresh()
 
     def save(self) -> None:
-        save_tasks(self.tasks)
+        self.repo.flush()
         messagebox.showinfo('Saved', 'Tasks saved')
 
 